@@ -0,0 +1,104 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+from typing import Iterator
+
+from core.solve_pool import SolvePool, solve_line
+
+
+columns = ("line", "input", "expression", "exact", "approximate", "latex_exact", "latex_approximate", "png_exact", "png_approximate", "warnings", "error")
+
+
+def read_lines(file, numbers: dict[int, tuple[int, str]]) -> Iterator[str]:
+    """
+    Yields each line of input that holds an expression, skipping blank lines and comments starting with '#'.
+
+    :param numbers: Filled with the line number and text of each yielded line, by the order it was yielded.
+    """
+
+    index = 0
+    for number, line in enumerate(file, start=1):
+        line = line.strip()
+        if line == '' or line.startswith('#'):
+            continue
+
+        numbers[index] = (number, line)
+        index += 1
+        yield line
+
+
+def parse_color(text: str) -> tuple[int, int, int]:
+    color = tuple(int(value) for value in text.split(','))
+    if len(color) != 3 or not all(0 <= value <= 255 for value in color):
+        raise ValueError
+
+    return color
+
+
+def main() -> int:
+    """
+    Solves every expression of the input, writing a row for each one as it finishes.
+
+    :return: The exit code, 1 if any expression could not be solved.
+    """
+
+    parser = argparse.ArgumentParser(description="Solves expressions without opening the app, one expression per line of input.")
+    parser.add_argument("input", nargs='?', default='-', help="a file with one expression per line, or '-' for stdin (lines are 'x + y | x = 3; y = 2' or JSON objects with an expression and terms)")
+    parser.add_argument("-o", "--output", default='-', help="the file the rows are written to, or '-' for stdout")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="the format of the rows")
+    parser.add_argument("--png", action="store_true", help="include png images of the answers, encoded as base64")
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 2) - 1), help="the amount of worker processes")
+    parser.add_argument("--timeout", type=float, default=30, help="the amount of seconds an expression can take before it is stopped")
+    parser.add_argument("--unordered", action="store_true", help="write rows as they finish instead of in the order of the input")
+    parser.add_argument("--precision", type=int, default=15, help="the amount of significant digits of the approximate answers")
+    parser.add_argument("--commas", action="store_true", help="separate the digits of large numbers with commas")
+    parser.add_argument("--dpi", type=int, default=300, help="the dpi of the png images")
+    parser.add_argument("--color", default="0,0,0", help="the color of the png images, as 'r,g,b'")
+    args = parser.parse_args()
+
+    try:
+        color = parse_color(args.color)
+    except ValueError:
+        parser.error("--color must be three integers from 0 to 255, like '255,255,255'")
+
+    file_in = sys.stdin if args.input == '-' else open(args.input, encoding="utf-8")
+    file_out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding="utf-8", newline='')
+
+    writer = None
+    if args.format == "csv":
+        writer = csv.DictWriter(file_out, [column for column in columns if args.png or not column.startswith("png")], extrasaction="ignore")
+        writer.writeheader()
+
+    numbers: dict[int, tuple[int, str]] = {}
+    items = ((line, args.png, args.commas, color, args.dpi, args.precision) for line in read_lines(file_in, numbers))
+    failed = 0
+
+    try:
+        with SolvePool(args.processes, args.timeout) as pool:
+            for index, value, error in pool.imap(solve_line, items, ordered=not args.unordered):
+                number, line = numbers.pop(index)
+                row = {"line": number, "input": line, **(value or {}), "error": error}
+
+                if writer is None:
+                    file_out.write(json.dumps(row, ensure_ascii=False) + '\n')
+                else:
+                    writer.writerow(row)
+
+                file_out.flush()  # rows are streamed, so the output can be read while the input is still being solved
+                failed += error is not None
+
+    finally:
+        if file_in is not sys.stdin:
+            file_in.close()
+        if file_out is not sys.stdout:
+            file_out.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # lets the worker processes start in a packaged app
+    sys.exit(main())
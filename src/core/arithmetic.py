@@ -0,0 +1,99 @@
+from fractions import Fraction
+import math
+
+import core.parser as parser
+
+
+def evaluate(node: parser.Node) -> Fraction | None:
+    """
+    Computes the exact value of an expression tree that only does arithmetic on numbers, without sympy.
+
+    Every step gives the same value sympy would, anything sympy would not leave as a rational number (roots, division by zero, symbols, and other functions) is left to sympy.
+
+    :return: The value, None if the tree is not pure arithmetic.
+    """
+
+    if isinstance(node, parser.Number):
+        return Fraction(node.value)
+
+    if isinstance(node, parser.Function):
+        name, operands = node.name, [evaluate(arg) for arg in node.args]
+    elif isinstance(node, parser.Operation):
+        name, operands = node.operator, [evaluate(operand) for operand in node.operands]
+    else:  # variables and constants
+        return None
+
+    if None in operands:
+        return None
+
+    if len(operands) == 1:
+        return unary(name, operands[0])
+
+    return binary(name, *operands)
+
+
+def unary(name: str, x: Fraction) -> Fraction | None:
+    """
+    Applies a prefix or postfix operator, or a function of one rational number.
+    """
+
+    if name == '+':
+        return x
+
+    if name == '-':
+        return -x
+
+    if name == "abs":
+        return abs(x)
+
+    if name == "floor":
+        return Fraction(math.floor(x))
+
+    if name == "ceil":
+        return Fraction(math.ceil(x))
+
+    if name == "sign":
+        return Fraction((x > 0) - (x < 0))
+
+    if x.denominator != 1 or x < 0:  # sympy only finds the factorials of whole numbers exactly
+        return None
+
+    if name == '!':
+        return Fraction(math.factorial(x.numerator))
+
+    if name == "!!":
+        return Fraction(math.prod(range(x.numerator, 0, -2)))
+
+    return None
+
+
+def binary(name: str, x: Fraction, y: Fraction) -> Fraction | None:
+    """
+    Applies a binary operator, or a function of two rational numbers.
+    """
+
+    if name == '+':
+        return x + y
+
+    if name == '-':
+        return x - y
+
+    if name == '*':
+        return x * y
+
+    if y == 0 and name in ('/', '%', "mod"):  # sympy gives complex infinity or nan
+        return None
+
+    if name == '/':
+        return x / y
+
+    if name in ('%', "mod"):  # the sign follows the divisor, the same as sympy's Mod
+        return x % y
+
+    if name in ('^', "pow"):
+        if y.denominator != 1 or (x == 0 and y < 0):  # roots are irrational, and zero to a negative power is complex infinity
+            return None
+
+        return x ** y.numerator
+
+    return None
@@ -0,0 +1,148 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+from numpy.typing import ArrayLike
+import sympy as sy
+
+from core.solve import Solve
+
+if TYPE_CHECKING:
+    from core.solver import Solver
+
+
+backends = {  # modules used by lambdify for each backend
+    "numpy": ["numpy"],
+    "mpmath": ["mpmath"],
+}
+
+
+def as_numbers(value: ArrayLike) -> np.ndarray:
+    """
+    Converts values to a float array, or a complex array if any are complex.
+    Integer arrays would otherwise wrap around silently once a power is larger than 64 bits.
+    """
+
+    array = np.asarray(value)
+    return array.astype(complex if np.iscomplexobj(array) else float)
+
+
+class BatchSolve:
+    """
+    Evaluates one expression over many values of its variables.
+
+    The expression is solved and simplified once, then compiled into a function that evaluates every value in a single call.
+    """
+
+    def __init__(self, expression: str, terms: dict[str, str] = dict(), backend: str = "numpy", session: "Solver | None" = None, solution: sy.Basic | None = None):
+        """
+        :param expression: The expression to evaluate.
+        :param terms: The definitions of the variables and constants, the variables being evaluated should be left blank.
+        :param backend: "numpy" for fast evaluation, or "mpmath" for evaluation using mpmath's precision.
+        :param session: Reuses the parsed expressions and solved variables of earlier solves.
+        :param solution: The simplified solution of the expression if it was already solved, such as by a worker process, so only compiling is left.
+        """
+
+        if backend not in backends:
+            raise Exception(f"unknown backend '{backend}'")
+
+        self.__backend = backend
+        self.__solution = solution if solution is not None else Solve(expression, terms, answer_display="Text", answer_copy="Text", session=session).get_solution()
+
+        self.__is_comparison = isinstance(self.__solution, (sy.core.relational.Relational, sy.logic.boolalg.BooleanAtom))  # true and false are comparisons of numbers
+
+        self.__symbols = sorted(self.__solution.free_symbols, key=lambda symbol: symbol.name)
+        self.__function = sy.lambdify(self.__symbols, self.__solution, modules=backends[backend])
+
+    def get_solution(self) -> sy.Basic:
+        """
+        Returns the simplified solution that is evaluated.
+        """
+
+        return self.__solution
+
+    def get_variables(self) -> list[str]:
+        """
+        Returns the names of the variables that need values, in alphabetical order.
+        """
+
+        return [symbol.name for symbol in self.__symbols]
+
+    def evaluate(self, values: dict[str, ArrayLike], exact_fallback: bool = True) -> np.ndarray:
+        """
+        Evaluates the expression for every set of values.
+
+        Values that fail to be evaluated numerically (errors, infinities, and NaN) are evaluated exactly with sympy instead.
+
+        :param values: The values of each variable, the arrays are broadcast against each other.
+        :param exact_fallback: If failed values are evaluated with sympy, otherwise they are left as NaN.
+        :return: The result for each set of values, complex if any result is not real, or bool for comparisons.
+        """
+
+        for name in self.get_variables():
+            if name not in values:
+                raise Exception(f"no values given for '{name}'")
+
+        shape = np.broadcast_shapes(*(np.shape(value) for value in values.values()))  # values of unused variables still shape the result
+        arrays = [np.broadcast_to(as_numbers(values[symbol.name]), shape) for symbol in self.__symbols]
+
+        result = self.__evaluate_numeric(arrays, shape)
+
+        failed = np.ones(shape, dtype=bool) if result is None else ~np.isfinite(result)
+        if result is None:
+            result = np.full(shape, np.nan)
+
+        if failed.any() and exact_fallback:
+            result = result.astype(complex)
+
+            for index in zip(*np.nonzero(failed)):
+                result[index] = self.__evaluate_exact([array[index] for array in arrays])
+
+        if np.iscomplexobj(result) and not np.any(result.imag):  # keeps real results real
+            result = result.real
+
+        return result
+
+    def __evaluate_numeric(self, arrays: list[np.ndarray], shape: tuple[int, ...]) -> np.ndarray | None:
+        """
+        Evaluates every set of values in a single call.
+
+        :return: The results as a bool, float, or complex array, None if the expression can't be evaluated numerically.
+        """
+
+        try:
+            with np.errstate(all="ignore"):  # failed values are found afterwards
+                if self.__backend == "numpy":
+                    result = self.__function(*arrays)
+                else:  # mpmath functions only take single values
+                    result = np.frompyfunc(self.__function, len(arrays), 1)(*arrays) if arrays else self.__function()
+                    result = np.asarray(result, dtype=object).astype(bool if self.__is_comparison else complex)  # comparisons are bool, the same as with numpy
+
+                result = np.broadcast_to(np.asarray(result), shape)  # constant expressions return a single value
+
+                if result.dtype.kind not in "biufc":
+                    return None
+
+                if result.dtype.kind in "iu":
+                    return result.astype(float)
+
+                return result
+
+        except Exception:
+            return None
+
+    def __evaluate_exact(self, row: list) -> complex:
+        """
+        Evaluates a single set of values with sympy.
+
+        :return: The result, NaN if it is not a finite number.
+        """
+
+        try:
+            value = complex(self.__solution.xreplace({symbol: sy.sympify(value) for symbol, value in zip(self.__symbols, row)}).evalf())
+        except (TypeError, ValueError):
+            return complex(np.nan)
+
+        if not np.isfinite(value):
+            return complex(np.nan)
+
+        return value
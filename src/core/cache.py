@@ -0,0 +1,197 @@
+from collections import OrderedDict
+import hashlib
+import os
+from typing import Any, Callable, Hashable
+
+import sympy as sy
+
+
+class LRUCache:
+    """
+    A bounded cache that evicts the least recently used entry once it is full.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        :param max_size: The maximum amount of entries kept in the cache.
+        """
+
+        self.__entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.__max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value stored for the key, and marks it as recently used.
+        """
+
+        if key not in self.__entries:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return self.__entries[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores the value, evicting the least recently used entries if the cache is full.
+        """
+
+        self.__entries[key] = value
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Returns the value stored for the key, computing and storing it with the function if it is missing.
+        """
+
+        if key in self.__entries:
+            self.hits += 1
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+        self.misses += 1
+        value = function()
+        self.set(key, value)
+
+        return value
+
+    def set_max_size(self, max_size: int) -> None:
+        """
+        Changes the maximum amount of entries, evicting entries if needed.
+        """
+
+        self.__max_size = max_size
+
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+
+class DiskCache:
+    """
+    A cache of bytes stored as files in a folder, the least recently used files are deleted once the folder is too large.
+    """
+
+    def __init__(self, folder: str | None, max_bytes: int, extension: str = ''):
+        """
+        :param folder: The folder the files are stored in, the cache does nothing if this is None.
+        :param max_bytes: The maximum total size of the stored files.
+        :param extension: The file extension added to each file name.
+        """
+
+        self.__folder = folder
+        self.__max_bytes = max_bytes
+        self.__extension = extension
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> bytes | None:
+        """
+        Returns the bytes stored for the key, and marks the file as recently used.
+        """
+
+        if self.__folder is None:
+            return None
+
+        path = self.__path(key)
+
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)  # the modified time is used to find the least recently used files
+
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    def set(self, key: Hashable, data: bytes) -> None:
+        """
+        Stores the bytes, deleting the least recently used files if the folder is too large.
+        """
+
+        if self.__folder is None:
+            return
+
+        try:
+            os.makedirs(self.__folder, exist_ok=True)
+
+            # writes to a temporary file first, so a partly written file is never read
+            path = self.__path(key)
+            with open(path + ".tmp", "wb") as file:
+                file.write(data)
+            os.replace(path + ".tmp", path)
+
+            self.__evict()
+
+        except OSError:
+            pass  # the value is computed again the next time it is used
+
+    def set_folder(self, folder: str | None) -> None:
+        """
+        Changes the folder the files are stored in, the cache does nothing if this is None.
+        """
+
+        self.__folder = folder
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        self.__max_bytes = max_bytes
+        self.__evict()
+
+    def __path(self, key: Hashable) -> str:
+        name = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.__folder, name + self.__extension)
+
+    def __evict(self) -> None:
+        """
+        Deletes the least recently used files until the folder is under its maximum size.
+        """
+
+        if self.__folder is None or not os.path.isdir(self.__folder):
+            return
+
+        entries = [entry for entry in os.scandir(self.__folder) if entry.is_file() and entry.name.endswith(self.__extension)]
+        size = sum(entry.stat().st_size for entry in entries)
+
+        if size <= self.__max_bytes:
+            return
+
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            size -= entry.stat().st_size
+            os.remove(entry.path)
+
+            if size <= self.__max_bytes:
+                break
+
+
+def structural_key(stage: str, expression: sy.Basic, *options: Hashable) -> tuple:
+    """
+    Creates a cache key from the canonical form of an expression.
+
+    :param stage: The name of the step that produced the cached value.
+    :param expression: The expression the step was applied to.
+    :param options: Any settings that change the result of the step.
+    """
+
+    return (stage, sy.srepr(expression), *options)
+
+
+results = LRUCache(512)  # simplified, expanded and approximated answers shared by every Solve
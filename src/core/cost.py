@@ -0,0 +1,199 @@
+from fractions import Fraction
+import math
+from typing import NamedTuple
+
+import core.arithmetic as arithmetic
+import core.parser as parser
+
+
+calculus_functions = {"diff", "integrate"}
+
+max_approximate_digits = 1e100  # answers with more digits are refused, since even their approximate form can't be computed
+deep_calculus = 3  # derivatives and integrals nested this deep warn that the answer can take a long time
+max_fold_digits = 100_000  # numbers predicted to have at most this many digits are computed exactly, which takes at most a few milliseconds
+
+constant_magnitudes = {  # the magnitudes of the constants sympy keeps as symbols, so powers of them are still found
+    'i': 0,
+    'e': math.log10(math.e),
+    'π': math.log10(math.pi),
+    'φ': math.log10((1 + math.sqrt(5)) / 2),
+    'γ': 0,
+}
+
+
+class Estimate(NamedTuple):
+    """
+    The predicted size of an expression once it is solved.
+    """
+
+    magnitude: float | None  # the most digits of the value's numerator and denominator (or of its integer part if it is not exact), None if it is unknown
+    digits: float  # the most digits of any exact number made while solving
+    depth: int  # the most derivatives and integrals nested within each other
+    is_exact: bool = True  # if the value is an exact number, otherwise its magnitude only bounds the size of its approximate form
+    value: Fraction | None = None  # the exact value, if the expression only does arithmetic on numbers small enough to compute
+
+
+def estimate(node: parser.Node, variables: dict[str, Estimate] = dict()) -> Estimate:
+    """
+    Predicts the size of an expression tree before it is solved, without solving it.
+
+    The predictions are upper bounds found from the digits of each number, so powers and factorials of large numbers are found before sympy computes them.
+    Arithmetic on numbers that are small enough is computed exactly instead, so only answers that really are large lose their exact form.
+
+    :param variables: The estimates of the variables used by the tree, other terms are treated as symbols.
+    """
+
+    if isinstance(node, parser.Number):
+        value = Fraction(node.value)
+        magnitude = value_magnitude(value)
+        return Estimate(magnitude, magnitude, 0, value=value)
+
+    if isinstance(node, parser.Term):
+        if node.name in variables:
+            return variables[node.name]
+
+        return Estimate(constant_magnitudes.get(node.name), 0, 0, False)
+
+    if isinstance(node, parser.Function):
+        name, operands = node.name, [estimate(arg, variables) for arg in node.args]
+    else:
+        name, operands = node.operator, [estimate(operand, variables) for operand in node.operands]
+
+    magnitude = combine(name, [operand.magnitude for operand in operands])
+    if name in ('^', "pow") and magnitude is not None and operands[1].value is not None and operands[1].magnitude < 300:  # a known exponent gives a tighter bound than its magnitude
+        magnitude = operands[0].magnitude * abs(float(operands[1].value))
+
+    is_exact = all(operand.is_exact for operand in operands)
+    depth = max(operand.depth for operand in operands) + (name in calculus_functions)
+
+    value = fold(name, [operand.value for operand in operands], magnitude)
+    if value is not None:  # the numbers made along the way are not part of the answer
+        magnitude = value_magnitude(value)
+        return Estimate(magnitude, magnitude, depth, value=value)
+
+    digits = max([operand.digits for operand in operands] + [(magnitude or 0) if is_exact else 0])
+
+    return Estimate(magnitude, digits, depth, is_exact)
+
+
+def value_magnitude(value: Fraction) -> float:
+    """
+    Returns the digits of a value's numerator and denominator, without converting them to strings.
+    """
+
+    return math.log10(max(abs(value.numerator), value.denominator, 1))
+
+
+def fold(name: str, values: list[Fraction | None], magnitude: float | None) -> Fraction | None:
+    """
+    Computes an operation or function of exact numbers, if the result is predicted to be small enough to compute quickly.
+
+    :param magnitude: The predicted magnitude of the result.
+    :return: The value, None if any operand is not known, the result is too large, or it is not a rational number.
+    """
+
+    if None in values:
+        return None
+
+    if name == "log" and len(values) == 2:  # logarithms are never larger than their operands
+        return exact_log(*values)
+
+    if magnitude is None or magnitude > max_fold_digits:
+        return None
+
+    if len(values) == 1:
+        return arithmetic.unary(name, values[0])
+
+    if len(values) == 2:
+        return arithmetic.binary(name, *values)
+
+    return None
+
+
+def exact_log(x: Fraction, base: Fraction) -> Fraction | None:
+    """
+    Returns the logarithm of a whole number if it is a whole power of the base, which sympy also finds exactly.
+    """
+
+    if x.denominator != 1 or base.denominator != 1 or x < 1 or base < 2:
+        return None
+
+    power = round(math.log(x.numerator) / math.log(base.numerator))
+    return Fraction(power) if base.numerator ** power == x.numerator else None
+
+
+def combine(name: str, magnitudes: list[float | None]) -> float | None:
+    """
+    Predicts the magnitude of an operation or function from the magnitudes of its operands.
+
+    :param name: The operator or function name.
+    :return: The magnitude, None if it is unknown (symbols, and functions sympy leaves unevaluated).
+    """
+
+    if None in magnitudes:
+        return None
+
+    if len(magnitudes) == 1 and name in ('+', '-', "abs", "floor", "ceil"):
+        return magnitudes[0]
+
+    if name in ('+', '-'):
+        return max(magnitudes) + math.log10(2)
+
+    if name in ('*', '/'):
+        return sum(magnitudes)
+
+    if name in ('^', "pow"):
+        return power(*magnitudes)
+
+    if name == '!':
+        return factorial(magnitudes[0])
+
+    if name == "!!":
+        return factorial(magnitudes[0]) / 2
+
+    if name in ('%', "mod"):
+        return min(magnitudes)
+
+    if name == "sqrt":
+        return magnitudes[0] / 2
+
+    if name in ("root", "random"):
+        return max(magnitudes)
+
+    if name in ("sign", "==", "!=", '<', '>', "<=", ">="):
+        return 0
+
+    return None
+
+
+def power(base: float, exponent: float) -> float:
+    """
+    Returns the magnitude of a power, the exponent's value is at most 10 ^ its magnitude.
+    """
+
+    if base == 0:  # the base is 0 or 1
+        return 0
+
+    return base * 10 ** exponent if exponent < 300 else math.inf
+
+
+def factorial(magnitude: float) -> float:
+    """
+    Returns the magnitude of a factorial, log10(n!) is at most n * log10(n).
+    """
+
+    return magnitude * 10 ** magnitude if magnitude < 300 else math.inf
+
+
+def format_digits(digits: float) -> str:
+    """
+    Formats a predicted amount of digits, very large amounts are written as a power of 10.
+    """
+
+    if digits < 1e15:
+        return f"about {digits:,.0f}"
+
+    if math.isinf(digits):
+        return "over 10^308"
+
+    return f"about 10^{math.log10(digits):.0f}"
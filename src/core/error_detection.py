@@ -1,14 +1,4 @@
-from core.symbols import accepted_characters, accepted_variables
-
-
-def valid_symbols(expression: str) -> None:
-    """
-    Raises an error if an unknown symbol is used in the expression.
-    """
-
-    for char in expression:
-        if char not in accepted_characters:
-            raise Exception(f"unknown symbol '{char}'")
+from core.symbols import accepted_variables
 
 
 def char_is_variable(char: str, function_name: str) -> None:
@@ -49,11 +39,21 @@ def all_is_int(array: tuple[str, ...], function_name: str) -> None:
                     raise Exception(f"{function_name}; a parameter is not an int")
 
 
-def circularly_defined(variables: dict[str, str]) -> None:
+def too_large(digits: str) -> None:
+    """
+    Raises an error for answers with too many digits to compute, even approximately.
+
+    :param digits: The formatted amount of digits the answer is predicted to have.
+    """
+
+    raise Exception(f"the answer is too large to compute, it would have {digits} digits")
+
+
+def circularly_defined(cycle: list[str]) -> None:
     """
-    Raises an error if a variable is circularly defined.
+    Raises an error for variables whose definitions depend on each other.
+
+    :param cycle: The variables in the order they depend on each other, starting and ending with the same variable.
     """
 
-    for x in variables:
-        if x in variables[x] and x != variables[x]:
-            raise Exception(f"'{x}' is circularly defined")
+    raise Exception(f"'{cycle[0]}' is circularly defined ({' → '.join(cycle)})")
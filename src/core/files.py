@@ -1,4 +1,5 @@
 import os
+import platform
 
 
 def path(path: str) -> str:
@@ -13,3 +14,52 @@ def path(path: str) -> str:
     root_path = os.path.dirname(os.path.dirname(os.path.dirname(this_file)))  # strips three levels of directories to get the root
 
     return os.path.join(root_path, path)  # combines the root path with the relative path
+
+
+def get_system_info() -> tuple[str, str]:
+    """
+    Finds the OS name that the user is using.
+    """
+
+    name = platform.system()
+    version = None
+
+    # gets the version of Windows
+    if name == "Windows":
+        version = platform.version()
+        build_number = int(version.split('.')[2])
+
+        if build_number >= 10240:
+            version = "10"
+
+        elif build_number >= 22000:
+            version = "11"
+
+    return name, version
+
+
+system_name, system_version = get_system_info()  # gets the system name and version
+
+
+def get_data_path(file_name: str | None):
+    """
+    Used to get the path to files which need permissions to use.
+    """
+
+    app_name = "Calculator App"
+
+    if system_name == "Windows":
+        app_data_folder = os.path.join(os.environ["APPDATA"], app_name)
+        if not os.path.exists(app_data_folder):
+            os.makedirs(app_data_folder)
+
+    elif system_name == "Darwin":
+        home = os.path.expanduser('~')
+        app_data_folder = os.path.join(home, "Library", "Application Support", app_name)
+        if not os.path.exists(app_data_folder):
+            os.makedirs(app_data_folder)
+
+    else:  # no folder is set on other systems
+        return None
+
+    return os.path.join(app_data_folder, file_name)
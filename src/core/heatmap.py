@@ -0,0 +1,136 @@
+import math
+
+import numpy as np
+
+from core.batch_solve import BatchSolve
+from core.cache import LRUCache
+
+
+batches = LRUCache(8)  # compiled expressions, kept by each worker process between tiles
+
+# colors of the heatmap from the lowest to the highest value
+colormap_positions = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+colormap_colors = np.array([
+    (68, 1, 84),
+    (59, 82, 139),
+    (33, 145, 140),
+    (94, 201, 98),
+    (253, 231, 37),
+])
+
+
+def evaluate_tile(expression: str, terms: dict[str, str], variables: tuple[str, str], bounds: tuple[float, float, float, float], size: int) -> np.ndarray:
+    """
+    Evaluates an expression of two variables over a square grid.
+
+    Runs in a worker process, the expression is compiled the first time the process sees it.
+
+    :param expression: The expression to evaluate.
+    :param terms: The definitions of the variables and constants, the two variables being evaluated are left blank.
+    :param variables: The names of the horizontal and vertical variables.
+    :param bounds: The area of the tile as (x min, x max, y min, y max).
+    :param size: The amount of samples along each side of the tile.
+    :return: The values of the tile with the top row first, NaN where the value is not a real number.
+    """
+
+    batch = batches.get_or_set((expression, tuple(sorted(terms.items()))), lambda: BatchSolve(expression, terms))
+
+    # samples the center of each cell
+    xMin, xMax, yMin, yMax = bounds
+    xs = xMin + (np.arange(size) + 0.5) * (xMax - xMin) / size
+    ys = yMax - (np.arange(size) + 0.5) * (yMax - yMin) / size
+
+    values = np.broadcast_to(batch.evaluate({variables[0]: xs[np.newaxis, :], variables[1]: ys[:, np.newaxis]}, exact_fallback=False), (size, size))
+
+    if np.iscomplexobj(values):
+        values = np.where(values.imag == 0, values.real, np.nan)
+
+    return values.astype(np.float32)
+
+
+def tile_level(scale: float, tile_pixels: int) -> int:
+    """
+    Returns the level of the tiles used at a zoom, tiles have a width of 2 ** level and are at most tile_pixels wide on screen.
+
+    :param scale: The amount of units per pixel.
+    """
+
+    return math.floor(math.log2(tile_pixels * scale))
+
+
+def visible_tiles(view: tuple[float, float, float, float], level: int) -> list[tuple[int, int]]:
+    """
+    Returns the tiles that overlap the view, closest to the center first.
+
+    :param view: The visible area as (x min, x max, y min, y max).
+    """
+
+    xMin, xMax, yMin, yMax = view
+    width = 2.0 ** level
+
+    columns = range(math.floor(xMin / width), math.floor(xMax / width) + 1)
+    rows = range(math.floor(yMin / width), math.floor(yMax / width) + 1)
+
+    centerX, centerY = (xMin + xMax) / 2 / width - 0.5, (yMin + yMax) / 2 / width - 0.5
+    return sorted(((column, row) for column in columns for row in rows), key=lambda tile: (tile[0] - centerX) ** 2 + (tile[1] - centerY) ** 2)
+
+
+def tile_bounds(level: int, column: int, row: int) -> tuple[float, float, float, float]:
+    """
+    Returns the area of a tile as (x min, x max, y min, y max).
+    """
+
+    width = 2.0 ** level
+    return column * width, (column + 1) * width, row * width, (row + 1) * width
+
+
+def round_range(low: float, high: float, steps: int = 8) -> tuple[float, float]:
+    """
+    Widens a range of colors to multiples of a round step, so small changes of the range give the same range.
+
+    :param steps: The least amount of steps in the range, the step is 1, 2, or 5 times a power of 10.
+    :return: The rounded low and high values.
+    """
+
+    span = high - low
+    if not math.isfinite(span) or span <= 0:
+        return low, high
+
+    power = 10 ** math.floor(math.log10(span / steps))
+    step = max(factor * power for factor in (1, 2, 5) if factor * power <= span / steps)
+
+    return math.floor(low / step) * step, math.ceil(high / step) * step
+
+
+def colorize(values: np.ndarray, low: float, high: float, contours: int = 0) -> np.ndarray:
+    """
+    Colors the values of a tile.
+
+    :param values: The values of the tile.
+    :param low: The value given the first color.
+    :param high: The value given the last color.
+    :param contours: The amount of evenly spaced contour lines drawn between low and high, 0 for none.
+    :return: The image as an array of RGBA pixels, undefined values are transparent.
+    """
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.clip((values - low) / (high - low) if high > low else np.full(values.shape, 0.5), 0, 1)
+
+    defined = np.isfinite(values)
+    t = np.where(defined, t, 0)
+
+    image = np.zeros((*values.shape, 4), dtype=np.uint8)
+    for channel in range(3):
+        image[..., channel] = np.interp(t, colormap_positions, colormap_colors[:, channel])
+
+    image[..., 3] = np.where(defined, 255, 0)
+
+    if contours > 0:
+        # darkens the cells where the contour band changes from the cell below or to the right
+        bands = np.where(defined, np.floor(t * contours), -1)
+        edges = np.zeros(values.shape, dtype=bool)
+        edges[:, :-1] |= bands[:, :-1] != bands[:, 1:]
+        edges[:-1, :] |= bands[:-1, :] != bands[1:, :]
+        image[edges & defined, :3] //= 2
+
+    return image
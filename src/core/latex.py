@@ -1,86 +1,74 @@
-import matplotlib.pyplot as plt
+import io
+from matplotlib.font_manager import FontProperties
+from matplotlib.mathtext import MathTextParser
+import numpy as np
 from PIL import Image
 import re
 import sympy as sy
 
+from core.cache import DiskCache, LRUCache
 from core.symbols import name_change_function, name_change_function_keys
-from core.system_settings import get_data_path
 
 
-def render_latex(latex_str, filename, dpi=300, text_color=(1, 1, 1)):
-    """
-    Renders a LaTex string into an image without clipping issues.
-    """
+mathtext_parser = MathTextParser("agg")  # reused for every render, so no figure or pyplot state is created
+mathtext_font = FontProperties(size=12)
 
-    text_color = text_color[0] / 255, text_color[1] / 255, text_color[2] / 255
+# rendered png images, keyed by the LaTeX string, comma setting, color, and dpi
+renders = LRUCache(64)
+renders_disk = DiskCache(None, 64 * 1024 * 1024, ".png")  # nothing is written to disk until the app sets a folder
 
-    # create a figure
-    fig = plt.figure()
 
-    # dynamically adjust the figsize based on text content
-    text = fig.text(0, 0, f"${latex_str}$", fontsize=12, color=text_color)
-    renderer = fig.canvas.get_renderer()
-    bbox = text.get_window_extent(renderer=renderer)
-
-    # convert pixel bbox to inches
-    bbox_inches = bbox.transformed(fig.dpi_scale_trans.inverted())
+def render_latex(latex_str: str, dpi: int = 300, text_color: tuple[int, int, int] = (255, 255, 255)) -> np.ndarray:
+    """
+    Renders a LaTeX string into an image in memory.
 
-    # add padding to avoid clipping
-    padding = .1  # used to ensure noting gets cut off
-    figsize = (bbox_inches.width + padding, bbox_inches.height + padding)
+    :param latex_str: The LaTeX string, without the surrounding '$'.
+    :param dpi: The resolution of the image.
+    :param text_color: Color of the text as a rgb value.
+    :return: The image as an array of RGBA pixels, bounded by the size of the text.
+    """
 
-    # set the new figsize based on calculated dimensions
-    fig.set_size_inches(figsize)
+    raster = mathtext_parser.parse(f"${latex_str}$", dpi=dpi, prop=mathtext_font)
+    alpha = np.asarray(raster.image)
 
-    # remove axes and other plot elements
-    plt.axis("off")
+    # colors every pixel, and uses the rendered text as the transparency
+    image = np.empty((*alpha.shape, 4), dtype=np.uint8)
+    image[..., :3] = text_color
+    image[..., 3] = alpha
 
-    # save the plot with tight bounding box
-    plt.savefig(filename, dpi=dpi, bbox_inches="tight", pad_inches=padding, transparent=True)
+    return image
 
-    # close the figure
-    plt.close(fig)
 
+def crop_image(image: np.ndarray) -> np.ndarray:
+    """
+    Crops an image to the bounding box of its non-transparent pixels.
 
-def crop_image(filename):
+    :param image: The image as an array of RGBA pixels.
+    :return: A view of the cropped image.
+    """
 
-    image_path = get_data_path(filename)
-    with Image.open(image_path) as img:
-        # Get image data
-        img_data = img.getdata()
+    visible = image[..., 3] != 0  # checks the alpha channel
 
-        # Find the bounding box of the non-transparent pixels
-        left = img.width
-        top = img.height
-        right = 0
-        bottom = 0
+    rows = np.flatnonzero(visible.any(axis=1))
+    columns = np.flatnonzero(visible.any(axis=0))
 
-        for y in range(img.height):
-            for x in range(img.width):
-                pixel = img_data[y * img.width + x]
-                if pixel[3] != 0:  # Check the alpha channel
-                    left = min(left, x)
-                    top = min(top, y)
-                    right = max(right, x)
-                    bottom = max(bottom, y)
+    if rows.size == 0:  # nothing to crop to
+        return image
 
-        # Crop the image to the bounding box
-        cropped_img = img.crop((left, top, right + 1, bottom + 1))
-        cropped_img.save(image_path)
+    return image[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
 
 
-def convert_render_latex(string: str, use_commas: bool = False, color: tuple[int, int, int] = (255, 255, 255), dpi: int = 300, filename: str = "Untitled.png", constant_amount: int = 0) -> str:
+def convert_render_latex(string: str, use_commas: bool = False, color: tuple[int, int, int] = (255, 255, 255), dpi: int = 300, constant_amount: int = 0) -> tuple[tuple, bytes]:
     """
     Takes a math expression as a string, and converts it into the LaTeX format.
-    Also renders the image of the LaTeX string as a png named "latex_answer.png".
+    Also renders the image of the LaTeX string as a png, reusing images that were rendered before.
 
     :param string: String to be converted into LaTeX format
     :param use_commas: If the image is rendered using number comma formatting.
     :param color: Color of the text as a rgb value.
     :param dpi: Sets the resolution of the image.
-    :param filename: The filename of the resulting image.
     :param constant_amount: The amount of arbitrary constants
-    :return: The formatted LaTeX string.
+    :return: The key the image is cached with (its first element is the formatted LaTeX string), and the bytes of the png.
     """
 
     latex = sy.latex(string, fold_short_frac=False)
@@ -93,10 +81,56 @@ def convert_render_latex(string: str, use_commas: bool = False, color: tuple[int
 
     latex = latex.replace(r"\bmod", r"\operatorname{mod}")  # stops mod from crashing the program when Ex: mod(x, y)
 
-    render_latex(latex, filename, text_color=color, dpi=dpi)
-    crop_image(filename)
+    key = (latex, use_commas, tuple(color), dpi)
+
+    png = renders.get(key)
+    if png is None:
+        png = renders_disk.get(key)
+
+        if png is None:
+            png = encode_png(crop_image(render_latex(latex, dpi, color)))
+            renders_disk.set(key, png)
+
+        renders.set(key, png)
+
+    return key, png
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """
+    Converts an array of RGBA pixels into the bytes of a png file.
+    """
+
+    output = io.BytesIO()
+    Image.fromarray(image, "RGBA").save(output, format="PNG")
+
+    return output.getvalue()
+
+
+def stack_images(pngs: list[bytes], spacing: int = 0) -> bytes:
+    """
+    Stacks png images from top to bottom, aligned to the left.
+
+    :param spacing: The amount of pixels between the images, defaults to half the height of the tallest image.
+    :return: The bytes of the stacked png.
+    """
+
+    images = [Image.open(io.BytesIO(png)).convert("RGBA") for png in pngs]
+
+    if spacing == 0:
+        spacing = max(image.height for image in images) // 2
+
+    stacked = Image.new("RGBA", (max(image.width for image in images), sum(image.height for image in images) + spacing * (len(images) - 1)), (0, 0, 0, 0))
+
+    y = 0
+    for image in images:
+        stacked.paste(image, (0, y))
+        y += image.height + spacing
+
+    output = io.BytesIO()
+    stacked.save(output, format="PNG")
 
-    return latex
+    return output.getvalue()
 
 
 def format_with_commas(latex_str):
@@ -1,6 +1,14 @@
-from PyQt6 import QtWidgets
 from random import randint
 
+import mpmath
+import sympy as sy
+
+from core.cache import LRUCache
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from PyQt6 import QtWidgets
+
 
 def get_position_change(key_list_prev: list, key_list_curr: list, string: str) -> int:
 
@@ -20,7 +28,7 @@ def get_position_change(key_list_prev: list, key_list_curr: list, string: str) -
     return i_curr - i_prev
 
 
-def get_line_edit_key(dictionary: dict, line_edit: QtWidgets.QLineEdit) -> str:
+def get_line_edit_key(dictionary: dict, line_edit: "QtWidgets.QLineEdit") -> str:
 
     for i, key in enumerate(sorted(dictionary.keys())):
         if dictionary[key][1] == line_edit:
@@ -32,18 +40,11 @@ def get_constant_values(dictionary: dict, digits: int) -> dict:
     Sets the amount of digits for the constants.
 
     :param dictionary: The dictionary of the constants.
-    :param digits: The amount of digits for the constants (counting from after the decimal place).
+    :param digits: The amount of digits for the constants (counting from after the decimal place), kept between 1 and 100.
     :return: Returns the dictionary, but the constants have the amount of digits specified.
     """
 
-    max_digits = 100
-    if digits > max_digits:
-        print(f"Constants will use their maximum saved value of {max_digits}, since the specified value is over that amount: {digits}")
-        digits = max_digits
-
-    elif digits < 1:
-        print(f"Constants will be 1 digit long, since the specified value is under that amount: {digits}")
-        digits = 1
+    digits = min(max(digits, 1), 100)  # 100 is the amount of digits saved for each constant
 
     digits += 2  # since digits are counted from after the decimal place, 2 is added to address this
 
@@ -55,6 +56,25 @@ def get_constant_values(dictionary: dict, digits: int) -> dict:
     return ans
 
 
+constant_values = LRUCache(64)  # values of the constants, keyed by their mpmath name and amount of digits
+
+
+def get_constant_value(constant: str, digits: int) -> sy.Float:
+    """
+    Computes the value of a constant with mpmath, to any amount of significant digits.
+
+    Each precision is only computed once, so changing the precision back and forth is instant.
+
+    :param constant: The name of the constant in mpmath, such as "pi" or "euler".
+    """
+
+    def compute() -> sy.Float:
+        with mpmath.workdps(digits):
+            return sy.Float(+getattr(mpmath, constant), digits)  # the unary plus evaluates the constant at the working precision
+
+    return constant_values.get_or_set((constant, digits), compute)
+
+
 def test_colors(settings) -> None:
     """
     Changes the colors of the windows to test if all colors are changing.
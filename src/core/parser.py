@@ -0,0 +1,348 @@
+import core.symbols as symbols
+
+
+class Token:
+    """
+    A single token of an expression.
+    """
+
+    __slots__ = ("kind", "text", "index")
+
+    def __init__(self, kind: str, text: str, index: int):
+        self.kind = kind  # "number", "variable", "constant", "function", "operator", "(", ")", ",", or "end"
+        self.text = text
+        self.index = index  # position of the token in the expression
+
+    def __repr__(self):
+        return f"Token({self.kind!r}, {self.text!r})"
+
+
+class Node:
+    """
+    Base class for the nodes of a parsed expression.
+    """
+
+    __slots__ = ()
+
+
+class Number(Node):
+    """
+    A number literal, kept as typed so decimals can be converted exactly.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: str):
+        self.value = value
+
+    def __repr__(self):
+        return f"Number({self.value!r})"
+
+
+class Term(Node):
+    """
+    A variable or a constant.
+    """
+
+    __slots__ = ("name", "is_constant")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.is_constant = name in symbols.accepted_constants
+
+    def __repr__(self):
+        return f"Term({self.name!r})"
+
+
+class Function(Node):
+    """
+    A call to one of the accepted functions.
+    """
+
+    __slots__ = ("name", "args")
+
+    def __init__(self, name: str, args: tuple[Node, ...]):
+        self.name = name
+        self.args = args
+
+    def __repr__(self):
+        return f"Function({self.name!r}, {self.args!r})"
+
+
+class Operation(Node):
+    """
+    A prefix, postfix, or binary operation.
+    """
+
+    __slots__ = ("operator", "operands")
+
+    def __init__(self, operator: str, operands: tuple[Node, ...]):
+        self.operator = operator
+        self.operands = operands
+
+    def __repr__(self):
+        return f"Operation({self.operator!r}, {self.operands!r})"
+
+
+# binding powers used by the parser, operators with a higher binding power are applied first
+binary_operators = {
+    "==": 10, "!=": 10, '<': 10, '>': 10, "<=": 10, ">=": 10,
+    '+': 20, '-': 20,
+    '*': 30, '/': 30, '%': 30,
+    '^': 50, "**": 50,
+}
+right_associative = {'^', "**"}
+prefix_operators = {'+': 40, '-': 40}
+postfix_operators = {'!': 60, "!!": 60}
+implicit_power = binary_operators['*']  # implicit multiplication has the same order as '*'
+
+operators = sorted(set(binary_operators) | set(prefix_operators) | set(postfix_operators) | {'='}, key=len, reverse=True)  # longest first so "**" is not read as two '*'
+function_max_length = max(len(name) for name in symbols.accepted_functions)
+function_names = set(symbols.accepted_functions)
+implicit_start = {"variable", "constant", "function", '('}  # tokens that start an implicitly multiplied factor
+
+
+def tokenize(expression: str) -> list[Token]:
+    """
+    Splits the expression into tokens in a single pass.
+
+    Function names are matched before single letter terms, so "sin" is not read as s * i * n.
+
+    :param expression: The expression without whitespace.
+    :return: The list of tokens, ending with an "end" token.
+    """
+
+    tokens: list[Token] = []
+    length = len(expression)
+    i = 0
+
+    while i < length:
+        char = expression[i]
+
+        # numbers and decimals
+        if char in symbols.accepted_numbers or char == '.':
+            start = i
+            while i < length and (expression[i] in symbols.accepted_numbers or expression[i] == '.'):
+                i += 1
+
+            number = expression[start:i]
+            if number == '.' or number.count('.') > 1:
+                raise Exception(f"invalid number '{number}'")
+
+            tokens.append(Token("number", number, start))
+            continue
+
+        # function names, the longest name at this position is used
+        if char.isalpha():
+            for size in range(min(function_max_length, length - i), 1, -1):
+                if expression[i:i + size] in function_names:
+                    tokens.append(Token("function", expression[i:i + size], i))
+                    i += size
+                    break
+
+            else:
+                if char in symbols.accepted_variables:
+                    tokens.append(Token("variable", char, i))
+                elif char in symbols.accepted_constants:
+                    tokens.append(Token("constant", char, i))
+                else:
+                    raise Exception(f"unknown symbol '{char}'")
+                i += 1
+
+            continue
+
+        if char in "(),":
+            tokens.append(Token(char, char, i))
+            i += 1
+            continue
+
+        for operator in operators:
+            if expression.startswith(operator, i):
+                tokens.append(Token("operator", operator, i))
+                i += len(operator)
+                break
+
+        else:
+            raise Exception(f"unknown symbol '{char}'")
+
+    tokens.append(Token("end", '', length))
+
+    return tokens
+
+
+class Parser:
+    """
+    Precedence climbing (Pratt) parser that turns a list of tokens into an expression tree.
+    """
+
+    def __init__(self, tokens: list[Token]):
+        self.__tokens = tokens
+        self.__position = 0
+
+    def parse(self) -> Node:
+        """
+        Parses the whole token list.
+        """
+
+        if self.__peek().kind == "end":
+            raise Exception("expression is empty")
+
+        node = self.__expression(0)
+
+        token = self.__peek()
+        if token.kind != "end":
+            raise self.__unexpected(token)
+
+        return node
+
+    def __peek(self) -> Token:
+        return self.__tokens[self.__position]
+
+    def __next(self) -> Token:
+        token = self.__tokens[self.__position]
+        self.__position += 1
+        return token
+
+    def __expect(self, kind: str) -> Token:
+        token = self.__next()
+        if token.kind != kind:
+            raise self.__unexpected(token)
+
+        return token
+
+    @staticmethod
+    def __unexpected(token: Token) -> Exception:
+        if token.kind == "end":
+            return Exception("expression is incomplete")
+
+        return Exception(f"unexpected '{token.text}'")
+
+    def __expression(self, power: int) -> Node:
+        """
+        Parses operations whose binding power is greater than the given power.
+
+        :param power: The binding power of the operator to the left.
+        """
+
+        left = self.__prefix()
+
+        while True:
+            token = self.__peek()
+
+            if token.kind == "operator":
+                operator = token.text
+
+                if operator in postfix_operators:
+                    if postfix_operators[operator] <= power:
+                        break
+                    self.__next()
+                    left = Operation(operator, (left,))
+                    continue
+
+                if operator not in binary_operators:
+                    raise self.__unexpected(token)
+
+                operator_power = binary_operators[operator]
+                if operator_power <= power:
+                    break
+
+                self.__next()
+                right = self.__expression(operator_power - 1 if operator in right_associative else operator_power)
+                left = Operation('^' if operator == "**" else operator, (left, right))
+
+            elif token.kind in implicit_start:  # implicit multiplication: 2x, x(y), sin(x)cos(x)
+                if implicit_power <= power:
+                    break
+
+                right = self.__expression(implicit_power)
+                left = Operation('*', (left, right))
+
+            else:
+                break
+
+        return left
+
+    def __prefix(self) -> Node:
+        """
+        Parses a single operand with its prefix operators.
+        """
+
+        token = self.__next()
+
+        if token.kind == "number":
+            return Number(token.text)
+
+        if token.kind == "variable" or token.kind == "constant":
+            return Term(token.text)
+
+        if token.kind == '(':
+            node = self.__expression(0)
+            self.__expect(')')
+            return node
+
+        if token.kind == "function":
+            self.__expect('(')
+
+            args = [self.__expression(0)]
+            while self.__peek().kind == ',':
+                self.__next()
+                args.append(self.__expression(0))
+
+            self.__expect(')')
+            return Function(token.text, tuple(args))
+
+        if token.kind == "operator" and token.text in prefix_operators:
+            operand = self.__expression(prefix_operators[token.text])
+            return Operation(token.text, (operand,))
+
+        raise self.__unexpected(token)
+
+
+def parse(expression: str) -> Node:
+    """
+    Parses an expression into an expression tree.
+
+    :param expression: The expression without whitespace.
+    :return: The root node of the tree.
+    """
+
+    return Parser(tokenize(expression)).parse()
+
+
+def find_terms(node: Node) -> set[str]:
+    """
+    Returns the names of all variables and constants used within the tree.
+    """
+
+    terms = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, Term):
+            terms.add(node.name)
+        elif isinstance(node, Function):
+            stack.extend(node.args)
+        elif isinstance(node, Operation):
+            stack.extend(node.operands)
+
+    return terms
+
+
+def find_functions(node: Node) -> set[str]:
+    """
+    Returns the names of all functions called within the tree.
+    """
+
+    functions = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, Function):
+            functions.add(node.name)
+            stack.extend(node.args)
+        elif isinstance(node, Operation):
+            stack.extend(node.operands)
+
+    return functions
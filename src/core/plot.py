@@ -0,0 +1,67 @@
+import math
+from typing import Callable
+
+import numpy as np
+
+
+def tile_range(start: float, stop: float, tiles: int = 4) -> tuple[int, int, int]:
+    """
+    Finds the tiles that cover an interval.
+
+    Tiles have a width that is a power of two, so the same tiles are used while panning, and only change after zooming by a factor of two.
+
+    :param start: The start of the interval.
+    :param stop: The end of the interval.
+    :param tiles: The least amount of tiles that span the interval.
+    :return: The level of the tiles (their width is 2 ** level), and the index of the first and last tile.
+    """
+
+    level = math.floor(math.log2((stop - start) / tiles))
+    width = 2.0 ** level
+
+    return level, math.floor(start / width), math.floor(stop / width)
+
+
+def adaptive_sample(function: Callable[[np.ndarray], np.ndarray], start: float, stop: float, tolerance: float, samples: int = 32, max_depth: int = 6) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Samples a function over an interval, adding more samples only where the function curves.
+
+    Every round checks how far each sample is from the line between its neighbors, and samples the middle of the intervals next to samples that are too far.
+    The new samples of each round are evaluated with a single call to the function.
+
+    :param function: Evaluates an array of inputs, returning an array of real values (NaN where the function is undefined).
+    :param start: The start of the interval.
+    :param stop: The end of the interval.
+    :param tolerance: The largest distance a sample can be from the line between its neighbors.
+    :param samples: The amount of evenly spaced intervals sampled first.
+    :param max_depth: The most times an interval can be split.
+    :return: The sorted inputs and their values.
+    """
+
+    xs = np.linspace(start, stop, samples + 1)
+    ys = function(xs)
+
+    for _ in range(max_depth):
+        # distance of each inner sample from the line between its neighbors
+        ratio = (xs[1:-1] - xs[:-2]) / (xs[2:] - xs[:-2])
+        with np.errstate(invalid="ignore"):
+            curved = np.abs(ys[1:-1] - (ys[:-2] + (ys[2:] - ys[:-2]) * ratio)) > tolerance
+
+        # intervals next to a curved sample, or where the function becomes undefined
+        split = np.zeros(len(xs) - 1, dtype=bool)
+        split[:-1] |= curved
+        split[1:] |= curved
+
+        defined = np.isfinite(ys)
+        split |= defined[:-1] != defined[1:]
+
+        if not split.any():
+            break
+
+        indices = np.flatnonzero(split)
+        middles = (xs[indices] + xs[indices + 1]) / 2
+
+        xs = np.insert(xs, indices + 1, middles)
+        ys = np.insert(ys, indices + 1, function(middles))
+
+    return xs, ys
@@ -0,0 +1,126 @@
+import time
+from typing import TYPE_CHECKING
+
+import sympy as sy
+
+if TYPE_CHECKING:
+    from core.solve_pool import SolvePool
+
+
+min_race_ops = 20  # smaller expressions are simplified faster than they can be sent to another process
+
+
+def cheap_simplify(expression: sy.Basic) -> sy.Basic:
+    """
+    Applies the canonicalizations that are fast for any expression, keeping each one only if it makes the expression shorter.
+
+    cancel and together combine fractions, powsimp combines powers with the same base or exponent, and expand_log is only used if a logarithm is present.
+    """
+
+    best = expression
+
+    passes = [sy.cancel, sy.together, sy.powsimp]
+    if expression.has(sy.log):
+        passes.append(lambda x: sy.expand_log(x, force=True))
+
+    for simplifier in passes:
+        try:
+            candidate = simplifier(best)
+        except Exception:  # some canonicalizations do not support every kind of expression
+            continue
+
+        if sy.count_ops(candidate) < sy.count_ops(best):
+            best = candidate
+
+    return best
+
+
+strategies = {
+    "simplify": sy.simplify,
+    "trigsimp": sy.trigsimp,
+    "radsimp": sy.radsimp,
+    "factor": sy.factor,
+    "cheap": cheap_simplify,
+}  # nsimplify is left out, since it replaces decimals with fractions that only look equal
+
+
+def simplify(expression: sy.Basic, budget: float | None = None, pool: "SolvePool | None" = None) -> tuple[sy.Basic, bool]:
+    """
+    Simplifies an expression in tiers, the cheap canonicalizations are applied first, then sympy's full simplify (which also applies trigsimp) is given the rest of the time budget.
+
+    The full simplify can't be stopped once started, so it runs on a process of the pool that is replaced if it takes too long, and the best expression found so far is returned instead.
+    Small expressions are simplified in this process, since they are simplified faster than they can be sent to another process.
+
+    :param budget: The most seconds spent simplifying, the full simplify always finishes if this is None.
+    :param pool: The processes the full simplify runs on, without one the full simplify always finishes (solves without a session already run on processes that are stopped if they take too long).
+    :return: The simplified expression, and if the full simplify finished.
+    """
+
+    if expression.is_Atom:
+        return expression, True
+
+    if budget is None or pool is None or sy.count_ops(expression) < min_race_ops:
+        return sy.simplify(expression), True
+
+    deadline = time.monotonic() + budget
+    best = cheap_simplify(expression)
+
+    results = pool.imap(run_strategy, [("simplify", expression)], timeout=max(deadline - time.monotonic(), 0))
+
+    try:
+        for index, value, error in results:
+            if error is None:
+                return value, True
+
+            if time.monotonic() < deadline:  # errors are raised the same way as without a budget
+                raise Exception(error)
+
+    finally:
+        results.close()  # replaces the process if the full simplify is still running
+
+    return best, False
+
+
+def run_strategy(name: str, expression: sy.Basic) -> sy.Basic:
+    """
+    Simplifies an expression with one of the strategies, called by the workers of the race and of budgeted simplifications.
+    """
+
+    return strategies[name](expression)
+
+
+def race(expression: sy.Basic, pool: "SolvePool", budget: float | None = None, good_enough: float = 0.2) -> tuple[sy.Basic, bool]:
+    """
+    Simplifies an expression with every strategy at once on a pool of processes, keeping the shortest result.
+
+    Results are compared as they arrive, the strategies still running are stopped once a result is good enough, once the full simplify finishes (it already tries most of the other strategies), or once the budget runs out.
+
+    :param budget: The most seconds the strategies can take, the timeout of the pool is used if this is None.
+    :param good_enough: A result with at most this fraction of the operations of the expression stops the race.
+    :return: The shortest expression found, and if the race finished before the budget ran out.
+    """
+
+    best = expression
+    best_ops = sy.count_ops(expression)
+    target = best_ops * good_enough
+
+    names = list(strategies)
+    start = time.monotonic()
+    results = pool.imap(run_strategy, [(name, expression) for name in names], ordered=False, timeout=budget)
+
+    try:
+        for index, value, error in results:
+            if error is not None:  # strategies that fail or run out of time are skipped
+                continue
+
+            ops = sy.count_ops(value)
+            if ops < best_ops or (ops == best_ops and names[index] == "simplify"):
+                best, best_ops = value, ops
+
+            if best_ops <= target or names[index] == "simplify":
+                return best, True
+
+    finally:
+        results.close()  # stops the strategies that are still running
+
+    return best, budget is None or time.monotonic() - start < budget  # every strategy finished in time
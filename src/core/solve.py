@@ -1,16 +1,139 @@
+from functools import cmp_to_key
 from inspect import currentframe
 from random import randint
+import sys
+from typing import TYPE_CHECKING, Callable, NamedTuple
 import sympy as sy
 
+import core.arithmetic as arithmetic
+import core.cache as cache
+import core.cost as cost
 import core.error_detection as error
-from core.latex import convert_render_latex
+from core.misc_functions import get_constant_value
+import core.parser as parser
+import core.simplify as simplify
 import core.str_format as str_format
 import core.symbols as symbols
-from core.system_settings import get_data_path
+
+if TYPE_CHECKING:
+    from core.solver import Solver
+
+
+operations_unary = {  # prefix and postfix operators of the parser
+    '+': lambda x: x,
+    '-': lambda x: -x,
+    '!': sy.factorial,
+    "!!": sy.factorial2,
+}
+
+operations_binary = {  # binary operators of the parser
+    '+': lambda x, y: x + y,
+    '-': lambda x, y: x - y,
+    '*': lambda x, y: x * y,
+    '/': lambda x, y: x / y,
+    '%': sy.Mod,
+    '^': lambda x, y: x ** y,
+    "==": lambda x, y: sy.S(x == y),  # structural comparison
+    "!=": lambda x, y: sy.S(x != y),
+    '<': sy.Lt,
+    '>': sy.Gt,
+    "<=": sy.Le,
+    ">=": sy.Ge,
+}
+
+
+representations = ("answer", "display", "copy", "render")  # the representations computed for each form of the answer
+
+Renderer = Callable[[sy.Basic, bool, tuple[int, int, int], int], tuple[tuple, bytes]]  # (answer, use_commas, color, dpi) -> (render key, png bytes)
+
+
+def render_png(answer: sy.Basic, use_commas: bool, color: tuple[int, int, int], dpi: int) -> tuple[tuple, bytes]:
+    """
+    The default renderer, renders the answer as a png with matplotlib.
+
+    matplotlib is only imported the first time an answer is rendered, so solving text answers stays cheap to import.
+    """
+
+    from core.latex import convert_render_latex
+    return convert_render_latex(answer, use_commas, color, dpi)
+
+
+class Result(NamedTuple):
+    """
+    Every form of a solved answer, the exact forms are None if a constant's literal value is used.
+    The png images are None unless images are used for the display or copying.
+    """
+
+    expression: str
+    exact: str | None
+    approximate: str
+    latex_exact: str | None
+    latex_approximate: str
+    png_exact: bytes | None = None
+    png_approximate: bytes | None = None
+    warnings: tuple[str, ...] = ()
+
+
+def approximate_factorial2(n: sy.Basic) -> sy.Basic:
+    """
+    Returns the double factorial of a float, using n!! = 2^(n/2) * (n/2)! for even n, and n!! = n! / (n - 1)!! for odd n.
+    """
+
+    if not isinstance(n, sy.Float) or sy.Float(int(n)) != n:
+        return sy.factorial2(n)
+
+    if int(n) % 2 == 0:
+        return 2 ** (n / 2) * sy.factorial(n / 2)
+
+    return sy.factorial(n) / (2 ** ((n - 1) / 2) * sy.factorial((n - 1) / 2))
+
+
+canonical_order = cmp_to_key(sy.Basic.compare)  # the order of the parts of sums and products made by sympy
+
+
+def rebuild(node: sy.Basic, args: list[sy.Basic]) -> sy.Basic:
+    """
+    Rebuilds a node whose numbers were replaced by floats, giving the same result as node.func(*args).
+
+    A sum or product that still has at most one number, and no parts that need to be combined (sums, products, and exp, which flatten evaluates),
+    is already in canonical form once its parts are sorted, so it is built directly instead of running sympy's flatten, which checks the assumptions of every part.
+    The parts are sorted with Basic.compare, the same order flatten gives them.
+    """
+
+    if node.is_Add or node.is_Mul:
+        numbers = [arg for arg in args if arg.is_Number]
+        parts = [arg for arg in args if not arg.is_Number]
+
+        is_same_shape = all(new.func == old.func or (new.is_Number and old.is_Number) for new, old in zip(args, node.args))
+        is_simple = len(numbers) <= 1 and all(number.is_Float for number in numbers) and not any(part.is_Add or part.is_Mul or part.func == sy.exp for part in parts)
+
+        if is_same_shape and is_simple:
+            if node.is_Mul:
+                return sy.Mul(*numbers, *sorted(parts, key=canonical_order), evaluate=False)
+
+            bases = [part.as_coeff_Mul()[1] for part in parts]
+            if len(set(bases)) == len(bases):  # terms that now only differ by their coefficient are added by flatten
+                return sy.Add(*numbers, *sorted(parts, key=canonical_order), evaluate=False)
+
+    return node.func(*args)
+
+
+uncached_functions = {"integrate", "random"}  # functions whose results differ between solves (arbitrary constants and random values)
 
 
 class Solve:
-    def __init__(self, expression: str, terms: dict[str, str] = dict(), answer_display: str = "Image", answer_copy: str = "Text", use_commas: bool = False, render_color: tuple[int, int, int] = (255, 255, 255), render_dpi: int = 300):
+    __methods: dict[str, Callable] = {}  # the method of each function name, shared by every Solve
+
+    def __init__(self, expression: str, terms: dict[str, str] = dict(), answer_display: str = "Image", answer_copy: str = "Text", use_commas: bool = False, render_color: tuple[int, int, int] = (255, 255, 255), render_dpi: int = 300, renderer: Renderer = render_png, session: "Solver | None" = None, values: dict[str, sy.Basic] = dict(), max_exact_digits: int = 4_000, simplify_budget: float | None = 5.0, race_simplify: bool = False, precision: int = 15):
+        """
+        :param renderer: Renders the answer into an image, only used if images are used for the display or copying. Must be a module level function to send results between processes.
+        :param session: Reuses the parsed expressions and solved variables of earlier solves.
+        :param values: Variables that were already solved, used in place of their definitions.
+        :param max_exact_digits: Answers predicted to have more digits only get their approximate form, at most the digits python can convert to a string.
+        :param simplify_budget: The most seconds each simplification can take before its best result so far is used, None lets every simplification finish. Only used with a session, whose process the simplifications run on.
+        :param race_simplify: Races several simplification strategies on the processes of the session, instead of simplifying in tiers. Only used with a session.
+        :param precision: The amount of significant digits of the approximate form.
+        """
 
         self.__expression = str_format.remove_white_spaces(expression)
         self.__terms = terms.copy()
@@ -20,8 +143,18 @@ class Solve:
         self.__use_commas = use_commas
         self.__render_color = render_color
         self.__render_dpi = render_dpi
-
-        self.__functions = tuple(getattr(self, f"_{self.__class__.__name__}__{name.lower()}") for name in symbols.accepted_functions)  # gets a list of all the functions
+        self.__renderer = renderer
+        self.__session = session
+        self.__values = values.copy()
+        self.__max_exact_digits = min(max_exact_digits, sys.get_int_max_str_digits() or max_exact_digits)  # the limit is 0 if python has none
+        self.__simplify_budget = simplify_budget
+        self.__race_simplify = race_simplify
+        self.__precision = max(precision, 1)
+        self.__is_numeric = False  # if numbers are solved as floats, since the exact answer is too large
+        self.__is_arithmetic = False  # if the expression only does arithmetic on numbers, so it was solved without sympy
+        self.__warnings: list[str] = []
+
+        self.__set_functions()
 
         self.__split_terms()  # split terms into variables and constants
         self.__format_variables()
@@ -29,34 +162,45 @@ class Solve:
         self.__is_approx = self.__is_approximate()
 
         self.__constant_counter = 0  # keeps track of the amount of constants used
-        
-        self.__answer_exact = None
-        self.__answer_approximate = None
+
+        self.__expression_simplified = None
+        self.__forms: dict[str, dict[str, object]] = {"exact": {}, "approximate": {}}  # representations of each form, computed the first time they are used
 
         self.__calculate()
 
+    def __getstate__(self) -> dict:
+        """
+        Removes the session when pickling, so results can be sent between processes.
+        """
+
+        state = self.__dict__.copy()
+        state[f"_{self.__class__.__name__}__session"] = None  # the session stays in the process that solved the expression
+        state[f"_{self.__class__.__name__}__forms"] = {form: values.copy() for form, values in self.__forms.items()}  # the worker may still be computing forms while this is sent
+
+        return state
+
     def __str__(self):
         """
         Returns the string representation of the solved expression.
         """
 
-        return self.__expression_solved
+        return str(self.__expression_solved)
 
-    def print(self) -> None:
+    def get_summary(self) -> str:
         """
-        Prints the initial expression, and the solved expressions.
+        Returns the initial expression followed by the solved expressions.
+        Only forms that were already computed are included.
         """
 
-        expression = self.__expression  # copies the expression to save the original
-        expression = expression.replace('¦', '')
-        for key in range(len(self.__functions)):
-            expression = expression.replace(f"§{key}", symbols.accepted_functions[key])
+        line = self.__expression
 
-        if self.__is_approx:  # if a constant value was used, only the approximate answer exists
-            print(f"{expression} ≈ {self.__answer_approximate}")
+        if not self.__is_approx and "answer" in self.__forms["exact"]:  # if a constant value was used, only the approximate answer exists
+            line += f" = {self.__forms['exact']['answer']}"
 
-        else:
-            print(f"{expression} = {self.__answer_exact} ≈ {self.__answer_approximate}")
+        if "answer" in self.__forms["approximate"]:
+            line += f" ≈ {self.__forms['approximate']['answer']}"
+
+        return line
 
     def get_terms(self):
         """
@@ -79,40 +223,121 @@ class Solve:
 
         return self.__constants
     
+    def get_solution(self) -> sy.Basic:
+        """
+        Returns the simplified solution as a sympy expression, before it is turned into its exact or approximate form.
+        """
+
+        return self.__simplified()
+
     def get_exact(self) -> str:
         """
         Returns the answer in its exact form.
         """
 
-        return self.__answer_exact
+        return self.__form("exact", "display")
 
     def get_approximate(self) -> str:
         """
         Returns the answer in its approximate form.
         """
-        return self.__answer_approximate
+        return self.__form("approximate", "display")
 
-    def get_exact_copy(self) -> str:
+    def get_exact_copy(self) -> str | bytes:
         """
         Returns the answer to be copied.
         """
 
-        if self.__answer_copy == "Text" or self.__answer_copy == "LaTeX":
-            return self.__answer_exact_copy
+        return self.__form("exact", "copy")
 
-        else:
-            return get_data_path("latex_exact.png")
-
-    def get_approximate_copy(self) -> str:
+    def get_approximate_copy(self) -> str | bytes:
         """
         Returns the answer to be copied.
         """
 
-        if self.__answer_copy == "Text" or self.__answer_copy == "LaTeX":
-            return self.__answer_approximate_copy
+        return self.__form("approximate", "copy")
 
-        else:
-            return get_data_path("latex_approximate.png")
+    def get_exact_image(self) -> bytes | None:
+        """
+        Returns the png bytes of the rendered exact answer, None if it is not rendered.
+        """
+
+        return self.__form("exact", "render")[1]
+
+    def get_approximate_image(self) -> bytes | None:
+        """
+        Returns the png bytes of the rendered approximate answer, None if it is not rendered.
+        """
+
+        return self.__form("approximate", "render")[1]
+
+    def get_exact_render_key(self) -> tuple | None:
+        """
+        Returns the key of the rendered exact answer, None if it is not rendered.
+        """
+
+        return self.__form("exact", "render")[0]
+
+    def get_approximate_render_key(self) -> tuple | None:
+        """
+        Returns the key of the rendered approximate answer, None if it is not rendered.
+        """
+
+        return self.__form("approximate", "render")[0]
+
+    def get_answer(self, form: str) -> sy.Basic | None:
+        """
+        Returns the "exact" or "approximate" form of the answer as a sympy expression, the exact form is None if a constant's literal value is used.
+        """
+
+        return self.__form(form, "answer")
+
+    def get_initial_form(self) -> str:
+        """
+        Returns the form that is displayed first, "approximate" if a constant's literal value is used, otherwise "exact".
+        """
+
+        return "approximate" if self.__is_approx else "exact"
+
+    def is_computed(self, form: str) -> bool:
+        """
+        Returns if every representation of the form ("exact" or "approximate") was already computed.
+        """
+
+        return len(self.__forms[form]) == len(representations)
+
+    def complete(self, is_cancelled: Callable[[], bool] = lambda: False) -> None:
+        """
+        Computes every representation of both forms, so none of them are computed when they are first used.
+
+        :param is_cancelled: Checked before each representation, computing stops once it returns True.
+        """
+
+        for form in self.__forms:
+            for representation in representations:
+                if is_cancelled():
+                    return
+
+                self.__form(form, representation)
+
+    def get_result(self) -> Result:
+        """
+        Returns every form of the answer as text, LaTeX, and images, computing the forms that were not computed yet.
+        """
+
+        exact = self.__form("exact", "answer")
+        approximate = self.__form("approximate", "answer")
+
+        return Result(
+            expression=self.__expression,
+            exact=None if exact is None else self.__format_after(exact),
+            approximate=self.__format_after(approximate),
+            latex_exact=None if exact is None else self.__format_latex(exact),
+            latex_approximate=self.__format_latex(approximate),
+            png_exact=self.__form("exact", "render")[1],
+            png_approximate=self.__form("approximate", "render")[1],
+            warnings=tuple(self.__warnings),
+        )
 
     def is_text_used(self) -> bool:
         """
@@ -123,10 +348,25 @@ class Solve:
 
     def uses_constant_literal(self) -> bool:
         """
-        Returns True if a constant's literal value is used.
+        Returns True if the answer only has an approximate form, since a constant's literal value is used, or the exact answer is too large.
+        """
+
+        return self.__is_approx
+
+    def get_warnings(self) -> list[str]:
+        """
+        Returns the warnings found before the expression was solved.
+        """
+
+        return self.__warnings
+
+    def __set_functions(self) -> None:
+        """
+        Maps each function name to its method, the methods are only looked up by the first Solve.
         """
-        
-        return any(self.__constants[constant] != symbols.constants[constant][0] for constant in self.__constants)
+
+        if not Solve.__methods:
+            Solve.__methods.update({name: getattr(Solve, f"_{Solve.__name__}__{name.lower()}") for name in symbols.accepted_functions})
 
     def __split_terms(self) -> None:
         """
@@ -155,162 +395,323 @@ class Solve:
 
     def __calculate(self) -> None:
         """
-        Calculates the solved expression in its exact and approximate form.
+        Solves the expression, and computes the form that is displayed first.
+
+        The other form is only computed once it is used.
         """
 
         self.__format_before()
-        self.__expression_solved = self.__solve(self.__expression_solved)  # solves the expression
-        self.__exact()  # turns the solution into its exact form
-        self.__approximate()  # turns the solution into its approximate form
-        self.__result_simplification()
 
-        if self.__answer_display == "Image" or self.__answer_copy == "Image":
-            self.__render()
+        order = self.__order_variables(sorted(parser.find_terms(self.__tree) & self.__variable_trees.keys()))
+        self.__estimate_cost(order)
 
-        self.__answer_exact_copy = self.__answer_exact
-        self.__answer_approximate_copy = self.__answer_approximate
+        value = None if self.__is_numeric else arithmetic.evaluate(self.__tree)
+        self.__is_arithmetic = value is not None
 
-        if self.__answer_display != "LaTeX":
-            self.__answer_exact = self.__format_after(self.__answer_exact)  # formats the exact and approximate answer
-            self.__answer_approximate = self.__format_after(self.__answer_approximate)
+        if self.__is_arithmetic:  # the answer is already a rational number, so there is nothing to simplify
+            self.__expression_solved = sy.Rational(value.numerator, value.denominator)
         else:
-            self.__answer_exact = self.__format_latex(self.__answer_exact)
-            self.__answer_approximate = self.__format_latex(self.__answer_approximate)
+            self.__resolve_variables(order)  # solves the variables used by the expression
+            self.__expression_solved = self.__solve(self.__tree)  # solves the expression
+
+        for representation in representations:
+            self.__form(self.get_initial_form(), representation)
 
-        if self.__answer_copy == "Text":
-            self.__answer_exact_copy = self.__format_after(self.__answer_exact_copy)
-            self.__answer_approximate_copy = self.__format_after(self.__answer_approximate_copy)
-        elif self.__answer_copy == "LaTeX":
-            self.__answer_exact_copy = self.__format_latex(self.__answer_exact_copy)
-            self.__answer_approximate_copy = self.__format_latex(self.__answer_approximate_copy)
+    def __form(self, form: str, representation: str) -> object:
+        """
+        Returns a representation of the exact or approximate form of the answer, computing it the first time it is used.
 
-    def __render(self) -> None:
+        :param form: "exact" or "approximate".
+        :param representation: "answer" (the sympy expression), "display", "copy", or "render" (the render key and png bytes).
         """
-        Renders images of the solved expression.
 
-        :param color: The color of the rendered text.
-        :param dpi: The quality of the image (also affects how much it can be expanded).
+        values = self.__forms[form]
+
+        if representation not in values:
+            if representation == "answer":
+                values[representation] = self.__exact() if form == "exact" else self.__approximate()
+
+            elif representation == "display":
+                values[representation] = self.__format_answer(self.__form(form, "answer"), "LaTeX" if self.__answer_display == "LaTeX" else "Text")
+
+            elif representation == "copy":
+                if self.__answer_copy == "Image":
+                    values[representation] = self.__form(form, "render")[1]
+                else:
+                    values[representation] = self.__format_answer(self.__form(form, "answer"), self.__answer_copy)
+
+            elif representation == "render":
+                values[representation] = self.__render(self.__form(form, "answer"))
+
+        return values[representation]
+
+    def __format_answer(self, answer: sy.Basic | None, answer_format: str) -> str:
+        """
+        Formats the answer as "Text" or "LaTeX".
         """
 
-        exact = get_data_path("latex_exact.png")
-        approximate = get_data_path("latex_approximate.png")
+        if answer_format == "LaTeX":
+            return self.__format_latex(answer)
 
-        if self.__answer_exact is not None:  # answer is not rendered if it is none
-            convert_render_latex(self.__answer_exact, self.__use_commas, self.__render_color, self.__render_dpi, exact, self.__constant_counter)
+        return self.__format_after(answer)
 
-        if self.__answer_approximate is not None:  # answer is not rendered if it is none
-            convert_render_latex(self.__answer_approximate, self.__use_commas, self.__render_color, self.__render_dpi, approximate, self.__constant_counter)
+    def __render(self, answer: sy.Basic | None) -> tuple[tuple | None, bytes | None]:
+        """
+        Renders an image of the answer, if images are used for the display or copying.
 
-    def __exact(self) -> None:
+        :return: The key of the image in the render cache, and the png bytes of the image.
         """
-        Turns the answer into its exact form.
+
+        if answer is None or "Image" not in (self.__answer_display, self.__answer_copy):  # answer is not rendered if it is none
+            return None, None
+
+        return self.__renderer(answer, self.__use_commas, self.__render_color, self.__render_dpi)
+
+    def __exact(self) -> sy.Basic | None:
+        """
+        Returns the answer in its exact form.
         """
 
-        if self.__is_approx:  # does not give an approximate value if a value for a constant is used
-            return
+        if self.__is_approx:  # does not give an exact value if a value for a constant is used
+            return None
 
-        self.__answer_exact = sy.simplify(self.__expression_solved)
+        return self.__expand_log(self.__simplified())  # ln(e^x) -> x, ln(x^n) -> nln(x), etc
 
-    def __custom_approximate(self, expression):
+    def __custom_approximate(self, expression: sy.Basic) -> sy.Basic:
         """
         Returns the approximate value of the expression.
+
+        Each unique subexpression is approximated once, and only the nodes that hold a number are rebuilt.
+        The result is the same as rebuilding every node with its approximated arguments.
         """
 
-        if expression.is_Atom:
-            # if the expression is a number, evaluates it numerically
-            if expression.is_Number:
-                return expression.evalf()
-            # if the expression is a symbol, returns it as is
+        approximations: dict[sy.Basic, sy.Basic] = {}  # the approximation of each subexpression already visited
+
+        def approximate(node: sy.Basic) -> sy.Basic:
+            if node in approximations:
+                return approximations[node]
+
+            if node.is_Atom:
+                # numbers are evaluated numerically, symbols are kept as is
+                result = node.evalf(self.__precision) if node.is_Number else node
+
             else:
-                return expression
+                args = [approximate(arg) for arg in node.args]
+
+                if node.func == sy.exp:  # prevents exp from being evaluated
+                    result = sy.exp(args[0], evaluate=False)
+                elif all(new is old for new, old in zip(args, node.args)):  # nothing inside changed
+                    result = node
+                else:
+                    result = rebuild(node, args)
+
+            approximations[node] = result
+            return result
+
+        return approximate(expression)
+
+    def __approximate(self) -> sy.Basic:
+        """
+        Returns the answer in its approximate form.
+        """
 
-        # prevents exp from being evaluated
-        elif expression.func == sy.exp:
-            arg = expression.args[0]
-            return sy.exp(self.__custom_approximate(arg), evaluate=False)
+        expression = self.__simplified()
+        if self.__is_arithmetic:  # evalf divides the numerator by the denominator with mpmath
+            return expression.evalf(self.__precision)
 
+        approximate = cache.results.get_or_set(cache.structural_key("approximate", expression, self.__precision), lambda: self.__custom_approximate(expression))
+
+        return self.__expand_log(approximate)  # ln(e^x) -> x, ln(x^n) -> nln(x), etc
+
+    def __simplified(self) -> sy.Basic:
+        """
+        Returns the simplified solution, which both forms start from.
+        """
+
+        if self.__expression_simplified is None:
+            self.__expression_simplified = self.__expression_solved if self.__is_arithmetic else self.__simplify(self.__expression_solved)
+
+        return self.__expression_simplified
+
+    def __simplify(self, expression: sy.Basic) -> sy.Basic:
+        """
+        Simplifies the expression, reusing the result if it was simplified before.
+
+        Results that ran out of time are not reused, so they are simplified again with the full budget.
+        """
+
+        is_racing = self.__race_simplify and self.__session is not None and sy.count_ops(expression) >= simplify.min_race_ops
+        is_racing = is_racing and self.__session.get_race_pool().is_ready()  # simplifies in tiers while the processes are loading sympy
+
+        key = cache.structural_key("race" if is_racing else "simplify", expression)
+        if key in cache.results:
+            return cache.results.get(key)
+
+        if is_racing:
+            simplified, is_complete = simplify.race(expression, self.__session.get_race_pool(), self.__simplify_budget)
         else:
-            # recursively applies custom_approx to all arguments of the expression
-            return expression.func(*[self.__custom_approximate(arg) for arg in expression.args])
+            pool = self.__session.get_simplify_pool() if self.__session is not None and self.__simplify_budget is not None else None
+            simplified, is_complete = simplify.simplify(expression, self.__simplify_budget, pool)
 
-    def __approximate(self) -> None:
+        if is_complete:
+            cache.results.set(key, simplified)
+            return simplified
+
+        warning = f"simplifying took longer than {self.__simplify_budget:g} seconds, so the answer may not be fully simplified"
+        if warning not in self.__warnings:
+            self.__warnings.append(warning)
+
+        return simplified
+
+    def __expand_log(self, expression: sy.Basic) -> sy.Basic:
         """
-        Turns the answer into its approximate form.
+        Expands the logarithms of the expression, reusing the result if it was expanded before.
         """
 
-        expression = sy.simplify(self.__expression_solved)
-        self.__answer_approximate = self.__custom_approximate(expression)
+        if not expression.has(sy.log):  # nothing to expand
+            return expression
+
+        return cache.results.get_or_set(cache.structural_key("expand_log", expression), lambda: sy.expand_log(expression, force=True))
 
     def __format_variables(self) -> None:
         """
-        Sets blank variables equal to themselves.
-        Performs variable substitution, and checks for circularly defined variables.
+        Parses the definition of each variable once, and finds the variables each definition depends on.
+        Blank variables, and variables set equal to themselves, are left as symbols.
         """
 
-        # sets blank variables equal to themselves
-        for key in self.__variables:
-            if self.__variables[key] == '':
-                self.__variables[key] = key
+        self.__variable_trees: dict[str, parser.Node] = {}
+        self.__variable_values: dict[str, sy.Basic] = self.__values.copy()  # solved definitions, shared by every use of the variable
 
-        # apply function_convert to handle functions within variables
         for key in self.__variables:
-            self.__variables[key] = str_format.function_convert(self.__variables[key])
-
-        # performs chained variable substitution: a=b and b=5 -> a=5
-        # keep iterating until no more substitutions can be made
-        max_iterations = len(self.__variables) + 1  # prevent infinite loops
-        for iteration in range(max_iterations):
-            changes_made = False
-            
-            for var_name in self.__variables:
-                if self.__variables[var_name] == var_name:
-                    continue
-                    
-                # check if this variable's definition contains other variables
-                if not str_format.contains_substring(self.__variables[var_name], list(self.__terms.keys())):
-                    continue
-                
-                # substitute all other variables in this variable's definition
-                original_value = self.__variables[var_name]
-                for other_var in self.__variables:
-                    if other_var != var_name and other_var in self.__variables[var_name]:
-                        # replace variable with its definition
-                        self.__variables[var_name] = self.__variables[var_name].replace(other_var, f"({self.__variables[other_var]})")
-                
-                # check for any changes
-                if self.__variables[var_name] != original_value:
-                    changes_made = True
-            
-            # if no changes, end loop
-            if not changes_made:
-                break
-
-        error.circularly_defined(self.__variables)  # checks for circularly defined variables
+            value = str_format.remove_white_spaces(self.__variables[key])
 
-    def __format_before(self) -> None:
+            if value == '' or value == key or key in self.__values:
+                continue
+
+            self.__variable_trees[key] = self.__parse(value)
+
+        # the defined variables used within each definition, sorted so errors are always reported the same way
+        self.__variable_dependencies: dict[str, list[str]] = {key: sorted(parser.find_terms(tree) & self.__variable_trees.keys()) for key, tree in self.__variable_trees.items()}
+
+    def __estimate_cost(self, order: list[str]) -> None:
         """
-        Formats the expression before it is solved.
+        Predicts the size of the answer before anything is solved.
+        Answers too large to compute exactly only get their approximate form, and answers too large for that are refused.
+
+        :param order: The variables used by the expression, in the order they are solved.
         """
 
-        expression = self.__expression
-        error.valid_symbols(expression)
-        expression = str_format.function_convert(expression)  # converts functions to a format so implicit multiplication won't change them
+        estimates: dict[str, cost.Estimate] = {}
+        for name in order:
+            estimates[name] = cost.estimate(self.__variable_trees[name], estimates)
+
+        estimate = cost.estimate(self.__tree, estimates)
 
-        for x in expression:  # replaces all terms with their defined values
-            if x in self.__variables:
-                expression = expression.replace(f"{x}", f"({self.__variables[x]})")
+        if max(estimate.digits, estimate.magnitude or 0) > cost.max_approximate_digits:
+            error.too_large(cost.format_digits(max(estimate.digits, estimate.magnitude or 0)))
 
-        expression = self.__implicit_to_explicit(expression)  # changes the expression to use explicit multiplication
-        expression = expression.replace('¦', '')  # removes the special character after implicit multiplication is formatted
+        if estimate.digits > self.__max_exact_digits:
+            self.__is_numeric = True
+            self.__is_approx = True
+            self.__warnings.append(f"the exact answer would have {cost.format_digits(estimate.digits)} digits, so only its approximate form is computed")
 
-        for key in sorted(self.__constants.keys(), key=lambda key: symbols.constant_order[key]):  # sorts the order to avoid substring replacement errors
-            if self.__constants[key] == symbols.constants[key][0]:
-                expression = expression.replace(key, symbols.constants[key][0])  # replaces the constant with it's recognized sympy symbol
+        if estimate.depth >= cost.deep_calculus:
+            self.__warnings.append(f"{estimate.depth} nested derivatives and integrals can take a long time to solve")
 
+    def __resolve_variables(self, order: list[str]) -> None:
+        """
+        Solves each variable used by the expression once, after the variables its definition depends on.
+        With a session, variables solved by an earlier solve are reused if nothing they depend on changed.
+
+        :param order: The variables used by the expression, in the order they are solved.
+        """
+
+        keys: dict[str, tuple | None] = {}
+
+        for name in order:
+            tree = self.__variable_trees[name]
+            keys[name] = self.__variable_key(name, keys)
+
+            if self.__session is None or keys[name] is None:
+                self.__variable_values[name] = self.__solve(tree)
             else:
-                expression = expression.replace(key, f"({symbols.constant_values[key]})")
+                self.__variable_values[name] = self.__session.variables.get_or_set(keys[name], lambda: self.__solve(tree))
 
-        self.__expression_solved = expression
+    def __variable_key(self, name: str, keys: dict[str, tuple | None]) -> tuple | None:
+        """
+        Returns the key a solved variable is reused with, made from everything its value depends on.
+
+        :param keys: The keys of the variables its definition depends on.
+        :return: The key, None if the variable can't be reused.
+        """
+
+        tree = self.__variable_trees[name]
+        dependencies = tuple(keys[dependency] for dependency in self.__variable_dependencies[name])
+
+        if None in dependencies or parser.find_functions(tree) & uncached_functions:
+            return None
+
+        terms = parser.find_terms(tree)
+        constants = tuple((constant, self.__constants.get(constant)) for constant in sorted(terms & symbols.accepted_constants))
+        values = tuple((term, self.__values[term]) for term in sorted(terms & self.__values.keys()))
+
+        return name, self.__variables[name], dependencies, constants, values, self.__is_numeric, self.__precision
+
+    def __order_variables(self, roots: list[str]) -> list[str]:
+        """
+        Orders the variables so each one comes after the variables its definition depends on.
+        Uses a depth first search, which also finds circular definitions of any length.
+
+        :param roots: The variables the search starts from.
+        :return: The roots and every variable they depend on, in topological order.
+        """
+
+        order: list[str] = []
+        is_ordered: dict[str, bool] = {}  # False while a variable's dependencies are being searched, True once it is ordered
+
+        for root in roots:
+            if root in is_ordered:
+                continue
+
+            path = [root]  # the chain of definitions currently being searched
+            is_ordered[root] = False
+            stack = [iter(self.__variable_dependencies[root])]
+
+            while stack:
+                for dependency in stack[-1]:
+                    if dependency not in is_ordered:
+                        path.append(dependency)
+                        is_ordered[dependency] = False
+                        stack.append(iter(self.__variable_dependencies[dependency]))
+                        break
+
+                    if not is_ordered[dependency]:  # the dependency is still in the path
+                        error.circularly_defined(path[path.index(dependency):] + [dependency])
+
+                else:  # every dependency is ordered
+                    stack.pop()
+                    name = path.pop()
+                    is_ordered[name] = True
+                    order.append(name)
+
+        return order
+
+    def __format_before(self) -> None:
+        """
+        Parses the expression before it is solved.
+        """
+
+        self.__tree = self.__parse(self.__expression)
+
+    def __parse(self, expression: str) -> parser.Node:
+        """
+        Parses an expression, reusing the tree of the session if it was parsed before.
+        """
+
+        if self.__session is None:
+            return parser.parse(expression)
+
+        return self.__session.parse(expression)
 
     def __format_after(self, expression: str) -> str:
         """
@@ -347,81 +748,66 @@ class Solve:
 
         return latex
 
-    def __result_simplification(self) -> None:
+    def __solve(self, node: parser.Node) -> sy.Basic:
         """
-        Some functions require steps to be further simplified.
+        Solves all math functions within the expression tree.
+
+        :param node: The root of the tree to be solved.
+        :return: The solved expression.
         """
 
-        if not self.__is_approx:
-            self.__answer_exact = sy.expand_log(self.__answer_exact, force=True)  # ln(e^x) -> x, ln(x^n) -> nln(x), etc
+        if isinstance(node, parser.Number):
+            if self.__is_numeric:  # floats stop large numbers from being computed exactly
+                return sy.Float(node.value, self.__precision)
 
-        self.__answer_approximate = sy.expand_log(self.__answer_approximate, force=True)  # ln(e^x) -> x, ln(x^n) -> nln(x), etc
+            if '.' in node.value:  # turns decimals into rationals
+                return sy.Rational(node.value)
 
-    def __implicit_to_explicit(self, string: str) -> str:
-        """
-        Reformats the expression from implicit multiplication to explicit multiplication.
+            return sy.Integer(node.value)
 
-        Gives the user more freedom to type expressions different ways.
-        """
+        if isinstance(node, parser.Term):
+            return self.__solve_term(node.name)
 
-        # adds multiplication symbol for implicit multiplication
-        x = 0
-        while x < len(string) - 1:
-            if string[x] in symbols.accepted_variables or string[x] in symbols.accepted_constants or string[x] in symbols.accepted_numbers or string[x] == ')' or string[x] == ']' or string[x] == '.':
-                if string[x + 1] in symbols.accepted_variables or string[x + 1] in symbols.accepted_constants or string[x + 1] == '(' or string[x + 1] == '§':
-                    # inserts in front of x
-                    string = string[:x + 1] + '*' + string[x + 1:]
-                    x -= 1
-            x += 1
+        if isinstance(node, parser.Function):
+            parameters = [self.__solve(arg) for arg in node.args]  # solves inner functions first
+            return Solve.__methods[node.name](self, *parameters)
 
-        # turns all decimals into rationals
-        temp = string + ' '  # character added to end of string to recognize final number
-        num = ''
-        for x in temp:
-            if x in symbols.accepted_numbers or x == '.':
-                num += x
-            else:
-                if num == '.':  # user error; displays "error" in answer box
-                    print("Not yet fixed, do later")
+        operands = [self.__solve(operand) for operand in node.operands]
 
-                elif num != '' and '.' in num:  # num is not blank, and is a decimal
-                    # replaces the first instance of each number
-                    string = string.replace(num, f"({sy.Rational(num)})", 1)
+        if len(operands) == 1:
+            if node.operator == "!!" and self.__is_numeric:  # sympy only finds the double factorial of integers
+                return approximate_factorial2(operands[0])
 
-                num = ''  # resets num
+            return operations_unary[node.operator](operands[0])
 
-        return string
+        return operations_binary[node.operator](*operands)
 
-    def __solve(self, expression: str) -> str:
+    def __solve_term(self, name: str) -> sy.Basic:
         """
-        Solves all math functions within the string.
+        Replaces a term with its defined value.
 
-        :param expression: The string to be solved.
-        :return: The solved string.
+        :param name: The variable or constant.
+        :return: The solved term.
         """
 
-        # solves a function with all of its inner functions and loops until all functions are solved
-        while '§' in expression:
-            expression = self.__function_check(expression)
+        if name in self.__constants:
+            if self.__constants[name] == symbols.constants[name][0]:
+                return symbols.sympy_constants[name]  # replaces the constant with it's recognized sympy symbol
 
-        return expression
-
-    def __function_check(self, expression: str) -> str:
-        """
-        Checks for math functions, solves them, and puts the answer back where the function was.
+            if name in symbols.mpmath_constants:
+                return get_constant_value(symbols.mpmath_constants[name], self.__precision + 6)  # the extra digits keep rounding errors out of the shown digits
 
-        :param expression: The expression with a possible function to be solved.
-        :return: The expression with the solved function.
-        """
+            return symbols.sympy_constants[name].evalf(self.__precision + 6)  # constants mpmath has no value for, such as i
 
-        function_id, parameters, index_start, index_end = str_format.get_function_parameters(expression)
-        ans = self.__functions[int(function_id)](*parameters)
+        if name in symbols.accepted_constants:  # constants without a defined value use their sympy symbol
+            return symbols.sympy_constants[name]
 
-        expression = str_format.replace_substring(expression, index_start - len(f"§{function_id}"), index_end, ans)
+        if name in self.__variable_values:
+            return self.__variable_values[name]
 
-        return expression
+        return symbols.sympy_variables[name]
 
-    def __diff(self, f: str, x: str) -> str:
+    def __diff(self, f: sy.Basic, x: sy.Basic) -> sy.Basic:
         """
         Differentiates the expression given.
 
@@ -429,15 +815,14 @@ class Solve:
         :param x: Differentiates with respect to the variable in x.
         """
 
-        x = str(sy.simplify(x))  # x cannot contain parentheses
-        error.char_is_variable(x, currentframe().f_code.co_name)  # checks if the independent variable is valid
-
-        f = self.__solve(f)  # solves functions within this function before solving it
+        x = self.__simplify(x)
+        error.char_is_variable(str(x), currentframe().f_code.co_name)  # checks if the independent variable is valid
 
         # solves the differentiation
-        return str(sy.diff(sy.simplify(f), sy.symbols(x)))
+        f = self.__simplify(f)
+        return cache.results.get_or_set(cache.structural_key("diff", f, x.name), lambda: sy.diff(f, x))
 
-    def __integrate(self, f: str, x: str) -> str:  # "integrate(f, x)" -> ∫(f)dx
+    def __integrate(self, f: sy.Basic, x: sy.Basic) -> sy.Basic:  # "integrate(f, x)" -> ∫(f)dx
         """
         Integrates the expression given.
 
@@ -445,128 +830,137 @@ class Solve:
         :param x: Integrates with respect to the variable in x.
         """
 
-        x = str(sy.simplify(x))  # x cannot contain parentheses
-        error.char_is_variable(x, currentframe().f_code.co_name)  # checks if the independent variable/s are valid
-
-        f = self.__solve(f)  # solves functions within this function before solving it
+        x = self.__simplify(x)
+        error.char_is_variable(str(x), currentframe().f_code.co_name)  # checks if the independent variable/s are valid
 
         # adds a unique constant
-        new_constant = 'C' + str_format.to_subscript(str(self.__constant_counter))
+        new_constant = sy.Symbol('C' + str_format.to_subscript(str(self.__constant_counter)))
         self.__constant_counter += 1
 
         # solves the integration
-        return str(sy.integrate(sy.simplify(f), sy.symbols(x))) + " + " + new_constant
+        f = self.__simplify(f)
+        return cache.results.get_or_set(cache.structural_key("integrate", f, x.name), lambda: sy.integrate(f, x)) + new_constant
+
+    def __log(self, x: sy.Basic, b: sy.Basic) -> sy.Basic:
+        return sy.log(x, b)
+
+    def __ln(self, x: sy.Basic) -> sy.Basic:
+        return sy.log(x)
 
-    def __log(self, x: str, b: str) -> str:
-        return f"log({x},{b})"
+    def __exp(self, x: sy.Basic) -> sy.Basic:
+        return sy.exp(x)
 
-    def __ln(self, x: str) -> str:
-        return f"ln({x})"
+    def __pow(self, x: sy.Basic, y: sy.Basic) -> sy.Basic:
+        return x ** y
 
-    def __exp(self, x: str) -> str:
-        return f"exp({x})"
+    def __root(self, x: sy.Basic, y: sy.Basic) -> sy.Basic:
+        return x ** (sy.S.One / y)
 
-    def __pow(self, x: str, y: str) -> str:
-        return f"({x})**({y})"
+    def __sqrt(self, x: sy.Basic) -> sy.Basic:
+        return sy.sqrt(x)
 
-    def __root(self, x: str, y: str) -> str:
-        return f"({x})**(1/{y})"
+    def __floor(self, x: sy.Basic) -> sy.Basic:
+        return self.__round_numeric(sy.floor, x)
 
-    def __sqrt(self, x: str) -> str:
-        return f"sqrt({x})"
+    def __ceil(self, x: sy.Basic) -> sy.Basic:
+        return self.__round_numeric(sy.ceiling, x)
+
+    def __round_numeric(self, function: Callable, x: sy.Basic) -> sy.Basic:
+        """
+        Rounds a number to a whole number, which stays a float when numbers are solved as floats, since it can be too large to convert to a string.
+        """
 
-    def __floor(self, x: str) -> str:
-        return f"floor({x})"
+        if self.__is_numeric and x.is_number:
+            return function(x.evalf(self.__precision)).evalf(self.__precision)
 
-    def __ceil(self, x: str) -> str:
-        return f"ceiling({x})"
+        return function(x)
 
-    def __sign(self, x: str) -> str:
-        return f"sign({x})"
+    def __sign(self, x: sy.Basic) -> sy.Basic:
+        return sy.sign(x)
 
-    def __random(self, a: str, b: str) -> str:
+    def __random(self, a: sy.Basic, b: sy.Basic) -> sy.Basic:
 
-        a = str(sy.simplify(a))
-        b = str(sy.simplify(b))
+        a = self.__simplify(a)
+        b = self.__simplify(b)
 
-        error.all_is_int((a, b), currentframe().f_code.co_name)
+        error.all_is_int((str(a), str(b)), currentframe().f_code.co_name)
 
-        return f"{randint(int(a), int(b))}"
+        return sy.Integer(randint(int(a), int(b)))
 
-    def __abs(self, x: str) -> str:
-        return f"Abs({x})"
+    def __abs(self, x: sy.Basic) -> sy.Basic:
+        return sy.Abs(x)
 
-    def __mod(self, x: str, y: str) -> str:
-        return f"Mod({x},{y})"
+    def __mod(self, x: sy.Basic, y: sy.Basic) -> sy.Basic:
+        return sy.Mod(x, y)
 
-    def __sin(self, x: str) -> str:
-        return f"sin({x})"
+    def __sin(self, x: sy.Basic) -> sy.Basic:
+        return sy.sin(x)
 
-    def __cos(self, x: str) -> str:
-        return f"cos({x})"
+    def __cos(self, x: sy.Basic) -> sy.Basic:
+        return sy.cos(x)
 
-    def __tan(self, x: str) -> str:
-        return f"tan({x})"
+    def __tan(self, x: sy.Basic) -> sy.Basic:
+        return sy.tan(x)
 
-    def __csc(self, x: str) -> str:
-        return f"csc({x})"
+    def __csc(self, x: sy.Basic) -> sy.Basic:
+        return sy.csc(x)
 
-    def __sec(self, x: str) -> str:
-        return f"sec({x})"
+    def __sec(self, x: sy.Basic) -> sy.Basic:
+        return sy.sec(x)
 
-    def __cot(self, x: str) -> str:
-        return f"cot({x})"
+    def __cot(self, x: sy.Basic) -> sy.Basic:
+        return sy.cot(x)
 
-    def __asin(self, x: str) -> str:
-        return f"asin({x})"
+    def __asin(self, x: sy.Basic) -> sy.Basic:
+        return sy.asin(x)
 
-    def __acos(self, x: str) -> str:
-        return f"acos({x})"
+    def __acos(self, x: sy.Basic) -> sy.Basic:
+        return sy.acos(x)
 
-    def __atan(self, x: str) -> str:
-        return f"atan({x})"
+    def __atan(self, x: sy.Basic) -> sy.Basic:
+        return sy.atan(x)
 
-    def __acsc(self, x: str) -> str:
-        return f"acsc({x})"
+    def __acsc(self, x: sy.Basic) -> sy.Basic:
+        return sy.acsc(x)
 
-    def __asec(self, x: str) -> str:
-        return f"asec({x})"
+    def __asec(self, x: sy.Basic) -> sy.Basic:
+        return sy.asec(x)
 
-    def __acot(self, x: str) -> str:
-        return f"acot({x})"
+    def __acot(self, x: sy.Basic) -> sy.Basic:
+        return sy.acot(x)
 
-    def __sinh(self, x: str) -> str:
-        return f"sinh({x})"
+    def __sinh(self, x: sy.Basic) -> sy.Basic:
+        return sy.sinh(x)
 
-    def __cosh(self, x: str) -> str:
-        return f"cosh({x})"
+    def __cosh(self, x: sy.Basic) -> sy.Basic:
+        return sy.cosh(x)
 
-    def __tanh(self, x: str) -> str:
-        return f"tanh({x})"
+    def __tanh(self, x: sy.Basic) -> sy.Basic:
+        return sy.tanh(x)
 
-    def __csch(self, x: str) -> str:
-        return f"csch({x})"
+    def __csch(self, x: sy.Basic) -> sy.Basic:
+        return sy.csch(x)
 
-    def __sech(self, x: str) -> str:
-        return f"sech({x})"
+    def __sech(self, x: sy.Basic) -> sy.Basic:
+        return sy.sech(x)
 
-    def __coth(self, x: str) -> str:
-        return f"coth({x})"
+    def __coth(self, x: sy.Basic) -> sy.Basic:
+        return sy.coth(x)
 
-    def __asinh(self, x: str) -> str:
-        return f"asinh({x})"
+    def __asinh(self, x: sy.Basic) -> sy.Basic:
+        return sy.asinh(x)
 
-    def __acosh(self, x: str) -> str:
-        return f"acosh({x})"
+    def __acosh(self, x: sy.Basic) -> sy.Basic:
+        return sy.acosh(x)
 
-    def __atanh(self, x: str) -> str:
-        return f"atanh({x})"
+    def __atanh(self, x: sy.Basic) -> sy.Basic:
+        return sy.atanh(x)
 
-    def __acsch(self, x: str) -> str:
-        return f"acsch({x})"
+    def __acsch(self, x: sy.Basic) -> sy.Basic:
+        return sy.acsch(x)
 
-    def __asech(self, x: str) -> str:
-        return f"asech({x})"
+    def __asech(self, x: sy.Basic) -> sy.Basic:
+        return sy.asech(x)
 
-    def __acoth(self, x: str) -> str:
-        return f"acoth({x})"
+    def __acoth(self, x: sy.Basic) -> sy.Basic:
+        return sy.acoth(x)
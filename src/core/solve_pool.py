@@ -0,0 +1,221 @@
+import base64
+import json
+import multiprocessing
+import time
+from typing import Callable, Iterable, Iterator
+
+from core.solve import Solve
+from core.worker import Worker
+
+
+def solve_item(expression: str, terms: dict[str, str], render: bool = False, use_commas: bool = False, render_color: tuple[int, int, int] = (0, 0, 0), render_dpi: int = 300, precision: int = 15) -> dict:
+    """
+    Solves an expression, returning every form of its answer.
+
+    :param render: If png images of the answers are included, encoded as base64.
+    :param precision: The amount of significant digits of the approximate answer.
+    :return: The fields of the solve's Result, without the images if they are not rendered.
+    """
+
+    result = Solve(expression, terms, answer_display="Image" if render else "Text", use_commas=use_commas, render_color=render_color, render_dpi=render_dpi, precision=precision).get_result()._asdict()
+
+    if render:
+        result["png_exact"] = encode_image(result["png_exact"])
+        result["png_approximate"] = encode_image(result["png_approximate"])
+    else:
+        del result["png_exact"], result["png_approximate"]
+
+    result["warnings"] = "; ".join(result["warnings"])
+
+    return result
+
+
+def encode_image(image: bytes | None) -> str | None:
+    return None if image is None else base64.b64encode(image).decode("ascii")
+
+
+def parse_line(line: str) -> tuple[str, dict[str, str]]:
+    """
+    Reads an expression and the definitions of its terms from a line of text.
+
+    Lines are either JSON objects like {"expression": "x + y", "terms": {"x": "3"}}, or text like "x + y | x = 3; y = log(8, 2)".
+
+    :return: The expression and its terms.
+    """
+
+    line = line.strip()
+
+    if line.startswith('{'):
+        try:
+            item = json.loads(line)
+            return str(item["expression"]), {str(term): str(value) for term, value in item.get("terms", {}).items()}
+        except (ValueError, KeyError, AttributeError):
+            raise Exception("the line is not an object with an expression and terms")
+
+    expression, _, definitions = line.partition('|')
+    terms = {}
+
+    for definition in definitions.split(';'):
+        if definition.strip() == '':
+            continue
+
+        term, separator, value = definition.partition('=')
+        if separator == '':
+            raise Exception(f"'{definition.strip()}' is missing '='")
+
+        terms[term.strip()] = value.strip()
+
+    return expression.strip(), terms
+
+
+def solve_line(line: str, render: bool = False, use_commas: bool = False, render_color: tuple[int, int, int] = (0, 0, 0), render_dpi: int = 300, precision: int = 15) -> dict:
+    """
+    Solves the expression on a line of text, see parse_line and solve_item.
+    """
+
+    expression, terms = parse_line(line)
+    return solve_item(expression, terms, render, use_commas, render_color, render_dpi, precision)
+
+
+class SolvePool:
+    """
+    Calls a function on many items using a pool of worker processes, without Qt.
+
+    Workers are started once and reused, so sympy is only loaded once per worker.
+    An item that takes too long stops its worker, which is replaced by a new one, as are the workers of items still running once the results stop being read.
+    """
+
+    def __init__(self, processes: int, timeout: float = 30, preload: tuple[str, ...] = ("core.solve_pool",)):
+        """
+        :param processes: The amount of worker processes.
+        :param timeout: The amount of seconds an item can take before it is stopped.
+        :param preload: Modules each worker imports before it starts taking items.
+        """
+
+        self.__context = multiprocessing.get_context("spawn")  # the same start method is used on every system
+        self.__timeout = timeout
+        self.__preload = preload
+        self.__workers = [Worker(self.__context, preload=preload) for _ in range(max(1, processes))]
+
+    def imap(self, function: Callable, items: Iterable[tuple], ordered: bool = True, timeout: float | None = None) -> Iterator[tuple[int, object, str | None]]:
+        """
+        Calls the function with the arguments of each item, yielding results as they finish.
+
+        Items are read from the iterable only when a worker is free, so the iterable can be a stream.
+
+        :param function: A module level function.
+        :param items: The arguments of each call.
+        :param ordered: If results are yielded in the order of the items, otherwise they are yielded as they finish.
+        :param timeout: Replaces the timeout of the pool for these items.
+        :return: Tuples of the item's index, the value returned, and an error message (None if the call succeeded).
+        """
+
+        running: dict[int, tuple[int, float | None]] = {}  # worker number -> (item index, time the worker started it)
+
+        try:
+            yield from self.__run(function, iter(enumerate(items)), ordered, self.__timeout if timeout is None else timeout, running)
+
+        finally:
+            for number in running:  # the results of items that were stopped early are never read
+                self.__replace(number)
+
+    def is_ready(self) -> bool:
+        """
+        Returns if every worker has loaded its modules.
+        """
+
+        return all(worker.is_ready() for worker in self.__workers)
+
+    def __run(self, function: Callable, items: Iterator[tuple[int, tuple]], ordered: bool, timeout: float, running: dict[int, tuple[int, float | None]]) -> Iterator[tuple[int, object, str | None]]:
+        """
+        Gives the items to the workers and collects their results, see imap.
+
+        :param running: Filled with the worker number, item index, and start time of each item being solved.
+        """
+
+        is_reading = True
+        done: dict[int, tuple] = {}  # finished results waiting for earlier items, when ordered
+        next_index = 0  # the next index yielded, when ordered
+
+        while is_reading or running:
+            is_idle = True
+
+            # gives items to free workers
+            for number, worker in enumerate(self.__workers):
+                if number in running or not is_reading:
+                    continue
+
+                item = next(items, None)
+                if item is None:
+                    is_reading = False
+                    break
+
+                index, args = item
+                worker.requests.put((index, function, tuple(args)))
+                running[number] = (index, time.monotonic() if worker.is_ready() else None)
+                is_idle = False
+
+            # collects finished items, and stops items that take too long
+            finished = []
+            for number, (index, time_start) in list(running.items()):
+                worker = self.__workers[number]
+
+                try:
+                    request_id, value, error = worker.results.get_nowait()
+                    finished.append((request_id, value, error))
+                    del running[number]
+                    continue
+
+                except Exception:  # no result yet
+                    pass
+
+                if not worker.is_alive():
+                    finished.append((index, None, "the solver stopped unexpectedly"))
+                    self.__replace(number)
+                    del running[number]
+
+                elif time_start is None:
+                    if worker.is_ready():  # the time spent loading sympy doesn't count towards the timeout
+                        running[number] = (index, time.monotonic())
+
+                elif time.monotonic() - time_start > timeout:
+                    finished.append((index, None, f"took longer than {timeout:g} seconds"))
+                    self.__replace(number)
+                    del running[number]
+
+            for result in finished:
+                is_idle = False
+
+                if not ordered:
+                    yield result
+                    continue
+
+                done[result[0]] = result
+                while next_index in done:
+                    yield done.pop(next_index)
+                    next_index += 1
+
+            if is_idle:
+                time.sleep(0.005)
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+
+        for worker in self.__workers:
+            worker.requests.put(None)
+
+        for worker in self.__workers:
+            worker.process.join(1)
+            worker.stop()
+
+    def __replace(self, number: int) -> None:
+        self.__workers[number].stop()
+        self.__workers[number] = Worker(self.__context, preload=self.__preload)
+
+    def __enter__(self) -> "SolvePool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
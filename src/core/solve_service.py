@@ -0,0 +1,284 @@
+import multiprocessing
+import queue
+import time
+
+from PyQt6 import QtCore
+
+from core.files import get_data_path
+import core.latex as latex
+from core.solve import Solve
+from core.solver import Solver
+from core.worker import Worker
+from core.worksheet import Worksheet, WorksheetResult, is_worksheet
+
+
+def solve_worker(requests: multiprocessing.Queue, results: multiprocessing.Queue, ready) -> None:
+    """
+    Solves requests in a separate process until None is received.
+
+    Each request is a tuple of the request id, the keyword arguments for Solve (None to only stop the current request), and if a preview should be sent first.
+    Each result is a tuple of the request id, the Solve object, an error message, and its kind: "preview", "final", or "complete".
+    Once the final result is sent, the form of the answer that is not displayed first is computed while the worker is idle.
+    The worker keeps a session for as long as it runs, so variables and worksheet lines that did not change are not solved again.
+    Worksheets stop between lines once a newer request is waiting, and so does computing the other form, so the worker doesn't need to be stopped.
+    """
+
+    session = Solver()
+    worksheet = Worksheet(session)
+
+    def is_cancelled() -> bool:
+        return not requests.empty()  # a newer request is waiting
+
+    def solve(kwargs: dict) -> Solve | WorksheetResult | None:
+        if is_worksheet(kwargs["expression"]):
+            return worksheet.solve(**kwargs, is_cancelled=is_cancelled)
+
+        return session.solve(**kwargs)
+
+    latex.renders_disk.set_folder(get_data_path("render_cache"))  # the app keeps rendered images between sessions
+    ready.set()  # sympy and matplotlib are loaded once this module is imported
+
+    while True:
+        request = requests.get()
+        if request is None:
+            return
+
+        request_id, kwargs, preview = request
+        if kwargs is None:
+            continue
+
+        try:
+            # sends the text answer before spending time on the image
+            if preview and "Image" in (kwargs.get("answer_display", "Image"), kwargs.get("answer_copy", "Text")):
+                answer = solve(kwargs | {"answer_display": "Text", "answer_copy": "Text"})
+                if answer is None:
+                    continue  # the worksheet was cancelled
+
+                results.put((request_id, answer, None, "preview"))
+
+            answer = solve(kwargs)
+            if answer is None:
+                continue
+
+            results.put((request_id, answer, None, "final"))
+
+        except Exception as error:
+            results.put((request_id, None, str(error), "final"))
+            continue
+
+        if is_cancelled():
+            continue
+
+        try:
+            answer.complete(is_cancelled)
+        except Exception:
+            continue  # the form is computed again if it is used, which shows the error
+
+        if not is_cancelled():
+            results.put((request_id, answer, None, "complete"))
+
+
+class SolveService(QtCore.QObject):
+    """
+    Solves expressions in a worker process so the window stays responsive.
+
+    Only the latest request is kept: a new request stops the one being solved, and results of older requests are dropped.
+    """
+
+    previewed = QtCore.pyqtSignal(object)  # emitted with a text only Solve object before the final result of a preview request
+    finished = QtCore.pyqtSignal(object)  # emitted with the Solve object of the latest request
+    completed = QtCore.pyqtSignal(object)  # emitted after finished, with the Solve object once both forms of its answer are computed
+    failed = QtCore.pyqtSignal(str)  # emitted with the error message of the latest request
+
+    def __init__(self, timeout: float = 30, parent: QtCore.QObject | None = None, preload: bool = True):
+        """
+        :param timeout: The amount of seconds a request can take before it is stopped.
+        :param preload: Starts the worker right away so the first request doesn't wait for sympy to load, otherwise it is started by the first request.
+        """
+
+        super().__init__(parent)
+
+        self.__context = multiprocessing.get_context("spawn")  # fork is not safe once Qt is running
+        self.__timeout = timeout
+
+        self.__worker: Worker | None = None  # not a daemon, so it can race simplifications on processes of its own
+        self.__spare: Worker | None = None  # replaces a stopped worker without waiting for sympy to load
+
+        self.__request_id = 0  # id of the latest request
+        self.__is_busy = False
+        self.__is_completing = False  # if the worker is computing the other form of the latest answer
+        self.__is_worksheet = False  # if the latest request is a worksheet, which stops on its own once a newer request is sent
+        self.__time_start = 0.0
+
+        # starts a new spare once typing pauses, so starting a process doesn't slow down each keystroke
+        self.__spare_timer = QtCore.QTimer(self)
+        self.__spare_timer.setSingleShot(True)
+        self.__spare_timer.setInterval(250)
+        self.__spare_timer.timeout.connect(self.__start_spare)
+
+        # checks for results while a request is being solved
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.setInterval(10)
+        self.__timer.timeout.connect(self.__poll)
+
+        if preload:
+            self.__start_worker()
+
+    def submit(self, preview: bool = False, **kwargs) -> int:
+        """
+        Solves an expression, stopping any request that is still being solved.
+        An answer whose other form is still being computed is not stopped, the worker stops computing it once it sees the new request, which keeps its session.
+
+        :param preview: Sends a text answer through previewed before the answer is rendered.
+        :param kwargs: The arguments passed to Solve.
+        :return: The id of the request.
+        """
+
+        if self.__worker is None:
+            self.__start_worker()
+
+        if self.__is_busy and not self.__is_worksheet:
+            self.__restart_worker()  # the only way to stop sympy is to stop the process
+
+        self.__request_id += 1
+        self.__worker.requests.put((self.__request_id, kwargs, preview))
+        self.__is_worksheet = is_worksheet(kwargs["expression"])
+
+        self.__is_busy = True
+        self.__time_start = time.monotonic()
+        self.__timer.start()
+
+        return self.__request_id
+
+    def cancel(self) -> None:
+        """
+        Stops the request being solved, its result is never emitted.
+        """
+
+        if self.__is_busy or self.__is_completing:
+            if self.__is_worksheet or not self.__is_busy:
+                self.__request_id += 1
+                self.__worker.requests.put((self.__request_id, None, False))  # keeps the worker, and the session it already filled
+            else:
+                self.__restart_worker()
+
+            self.__set_idle()
+
+    def is_busy(self) -> bool:
+        """
+        Returns if a request is being solved.
+        """
+
+        return self.__is_busy
+
+    def get_request_id(self) -> int:
+        """
+        Returns the id of the latest request, results are only emitted for this request.
+        """
+
+        return self.__request_id
+
+    def set_timeout(self, timeout: float) -> None:
+        """
+        Sets the amount of seconds a request can take before it is stopped.
+        """
+
+        self.__timeout = timeout
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes.
+        """
+
+        self.__timer.stop()
+        self.__spare_timer.stop()
+
+        for worker in (self.__worker, self.__spare):
+            if worker is not None:
+                worker.stop()
+
+    def __restart_worker(self) -> None:
+        """
+        Replaces the worker with the spare, and starts a new spare shortly after.
+        The old worker is stopped without waiting for it, so the window isn't blocked.
+        """
+
+        if not self.__worker.is_ready():  # the worker hasn't started solving, so its waiting requests are removed instead
+            try:
+                while True:
+                    self.__worker.requests.get_nowait()
+            except queue.Empty:
+                return
+
+        self.__worker.stop(wait=False)
+
+        if self.__spare is None:  # restarted again before the spare was started
+            self.__start_spare()
+
+        self.__worker, self.__spare = self.__spare, None
+        self.__spare_timer.start()
+
+    def __start_worker(self) -> None:
+        self.__worker = Worker(self.__context, solve_worker, daemon=False)
+        self.__start_spare()
+
+    def __start_spare(self) -> None:
+        if self.__spare is None:
+            self.__spare = Worker(self.__context, solve_worker, daemon=False)
+
+    def __set_idle(self) -> None:
+        self.__is_busy = False
+        self.__is_completing = False
+        self.__timer.stop()
+
+    def __poll(self) -> None:
+        """
+        Emits the results of the latest request once they arrive, and stops requests that take too long.
+        """
+
+        while True:
+            try:
+                request_id, solve, error, kind = self.__worker.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if request_id != self.__request_id:
+                continue  # drops results of old requests
+
+            if kind == "preview":
+                self.previewed.emit(solve)
+                continue
+
+            if kind == "complete":
+                self.__set_idle()
+                self.completed.emit(solve)
+                return
+
+            self.__set_idle()
+
+            if error is None:
+                self.__is_completing = True
+                self.__timer.start()  # keeps polling for the completed answer
+                self.finished.emit(solve)
+            else:
+                self.failed.emit(error)
+
+            return
+
+        if self.__is_completing:
+            if not self.__worker.is_alive():
+                self.__restart_worker()
+                self.__set_idle()  # the answer is still usable, its other form is computed when it is used
+
+        elif not self.__worker.is_alive():
+            self.__restart_worker()
+            self.__set_idle()
+            self.failed.emit("the solver stopped unexpectedly")
+
+        elif not self.__worker.is_ready():
+            self.__time_start = time.monotonic()  # the time spent loading sympy doesn't count towards the timeout
+
+        elif time.monotonic() - self.__time_start > self.__timeout:
+            self.__restart_worker()
+            self.__set_idle()
+            self.failed.emit(f"took longer than {self.__timeout:g} seconds")
@@ -0,0 +1,131 @@
+import sys
+
+import sympy as sy
+
+from core.batch_solve import BatchSolve
+import core.cache as cache
+from core.cache import LRUCache
+import core.parser as parser
+import core.simplify as simplify
+from core.solve import Solve
+from core.solve_pool import SolvePool
+import core.str_format as str_format
+
+
+class Solver:
+    """
+    A long lived solving session, which keeps what it learns between solves.
+
+    Parsed expressions, solved variables, and compiled expressions are kept, so solving again after one variable changes only solves what depends on that variable.
+    """
+
+    def __init__(self, cache_size: int = 256, compiled_size: int = 16, race_processes: int = len(simplify.strategies)):
+        """
+        :param cache_size: The amount of parsed expressions, and the amount of solved variables kept.
+        :param compiled_size: The amount of compiled expressions kept.
+        :param race_processes: The amount of processes simplification strategies are raced on, they are started the first time a solve races.
+        """
+
+        self.trees = LRUCache(cache_size)  # parsed expressions, keyed by their text
+        self.variables = LRUCache(cache_size)  # solved variables, keyed by their definition and everything it depends on
+        self.compiled = LRUCache(compiled_size)  # compiled expressions, keyed by their text, terms, and backend
+
+        self.__race_processes = race_processes
+        self.__race_pool: SolvePool | None = None
+        self.__simplify_pool: SolvePool | None = None
+
+    def solve(self, expression: str, terms: dict[str, str] = dict(), **kwargs) -> Solve:
+        """
+        Solves an expression using the session.
+
+        :param kwargs: The other arguments passed to Solve.
+        """
+
+        return Solve(expression, terms, session=self, **kwargs)
+
+    def compile(self, expression: str, terms: dict[str, str] = dict(), backend: str = "numpy", solution: sy.Basic | None = None) -> BatchSolve:
+        """
+        Compiles an expression to be evaluated over many values, reusing it if it was compiled before with the same terms.
+
+        :param solution: The simplified solution of the expression if it was solved elsewhere, such as by a SolveService, so it isn't solved again.
+        """
+
+        return self.compiled.get_or_set(self.__compiled_key(expression, terms, backend), lambda: BatchSolve(expression, terms, backend, session=self, solution=solution))
+
+    def is_compiled(self, expression: str, terms: dict[str, str] = dict(), backend: str = "numpy") -> bool:
+        """
+        Returns if the expression was compiled before with the same terms, so compiling it again is instant.
+        """
+
+        return self.__compiled_key(expression, terms, backend) in self.compiled
+
+    def __compiled_key(self, expression: str, terms: dict[str, str], backend: str) -> tuple:
+        return str_format.remove_white_spaces(expression), tuple(sorted(terms.items())), backend
+
+    def get_race_pool(self) -> SolvePool:
+        """
+        Returns the pool simplification strategies are raced on, starting it the first time it is used.
+        """
+
+        if self.__race_pool is None:
+            self.__race_pool = SolvePool(self.__race_processes, preload=("core.simplify",))
+
+        return self.__race_pool
+
+    def get_simplify_pool(self) -> SolvePool:
+        """
+        Returns the process full simplifications with a time budget run on, starting it the first time it is used.
+        """
+
+        if self.__simplify_pool is None:
+            self.__simplify_pool = SolvePool(1, preload=("core.simplify",))
+
+        return self.__simplify_pool
+
+    def parse(self, expression: str) -> parser.Node:
+        """
+        Parses an expression without whitespace, reusing its tree if it was parsed before.
+        """
+
+        return self.trees.get_or_set(expression, lambda: parser.parse(expression))
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Returns the hits, misses, and size of each cache used by the session.
+        The results and renders caches are shared by every session in the process.
+        """
+
+        caches = {
+            "parse": self.trees,
+            "variables": self.variables,
+            "compiled": self.compiled,
+            "results": cache.results,
+        }
+
+        latex = sys.modules.get("core.latex")  # the renderer is only loaded once an image is rendered
+        if latex is not None:
+            caches["renders"] = latex.renders
+
+        return {name: {"hits": values.hits, "misses": values.misses, "size": len(values)} for name, values in caches.items()}
+
+    def clear(self) -> None:
+        """
+        Removes everything kept by the session.
+        """
+
+        self.trees.clear()
+        self.variables.clear()
+        self.compiled.clear()
+
+    def close(self) -> None:
+        """
+        Stops the processes strategies are raced on, and the process simplifications run on.
+        """
+
+        if self.__race_pool is not None:
+            self.__race_pool.close()
+            self.__race_pool = None
+
+        if self.__simplify_pool is not None:
+            self.__simplify_pool.close()
+            self.__simplify_pool = None
@@ -1,6 +1,7 @@
+import os
 from PyQt6 import QtCore, QtGui
 
-from core.system_settings import get_data_path
+from core.files import get_data_path
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -8,6 +9,8 @@ if TYPE_CHECKING:
 
     from ui.common.CaretTextEdit import CaretTextEdit
     from ui.common.WrapTextButton import WrapTextButton
+    from ui.components.PagePlot import PagePlot
+    from ui.components.PageTable import PageTable
     from ui.components.PageTerms import PageTerms
 
 class Settings:
@@ -89,12 +92,19 @@ class Settings:
 
         # answer box
         self.__answer_default = "Answer"
+        self.__answer_computing = "Computing…"  # shown while the answer is being solved
         self.__answer_format_font_size = 20  # the size of the symbol that shows the current selected answer format
         self.__answer_format_indent = 10  # the distance from the format symbol and the left side of the answer box
 
         self.__box_answer_height_scale = 2 / 5  # fraction of screen height
         self.__box_answer_padding = 20  # distance from the image to the border of the answer box
         self.__latex_image_dpi = 800
+        self.__answer_image_cache_size = 32  # amount of rendered answers kept loaded for the answer box
+        self.__solve_timeout = 30  # seconds an answer can take before it is stopped
+        self.__solve_max_exact_digits = 4_000  # answers predicted to be longer than this are only approximated, python can't convert integers over 4,300 digits to strings
+        self.__solve_simplify_budget = 5  # seconds each simplification can take before its best result so far is used
+        self.__solve_race_simplify = False  # races several simplification strategies on extra processes, uses more cores to finish hard answers sooner
+        self.__live_answer_delay = 400  # milliseconds without typing before a live answer is solved
 
         # multi box
         self.__content_margin = 10  # distance between the scroll content, and the border
@@ -103,6 +113,19 @@ class Settings:
         self.__symbols_button_height = 50  # height of the copy buttons, all buttons have the same height
         self.__radio_button_radius = 13  # the radius of the radio buttons
         self.__radio_button_border_radius = int(self.__radio_button_radius / 2) + 2  # the border radius of the radio buttons
+        self.__table_max_rows = 10_000_000  # the largest amount of rows in the table page
+        self.__table_block_size = 1024  # amount of rows of the table computed at once
+        self.__table_cache_blocks = 64  # amount of computed blocks of rows kept by the table
+        self.__table_precision = 10  # significant digits shown in the table
+        self.__plot_samples = 32  # evenly spaced samples in each tile of the plot, before more are added where the graph curves
+        self.__plot_max_depth = 6  # the most times an interval of a plot tile can be split
+        self.__plot_tolerance = 1 / 500  # the largest error of the plotted line, as a fraction of a tile's width
+        self.__plot_cache_tiles = 256  # amount of sampled plot tiles kept
+        self.__heatmap_workers = max(1, (os.cpu_count() or 2) - 1)  # worker processes evaluating heatmap tiles
+        self.__heatmap_tile_pixels = 256  # the largest width of a heatmap tile on screen
+        self.__heatmap_sizes = 32, 256  # samples along each side of a heatmap tile, in the coarse and the final pass
+        self.__heatmap_cache_tiles = 512  # amount of evaluated heatmap tiles kept
+        self.__heatmap_contours = 10  # contour lines between the lowest and highest visible values of the heatmap
 
         # buttons
         self.__button_text_hover_raise = 5  # the height text is raised when a button is being hovered
@@ -147,6 +170,8 @@ class Settings:
         self.__use_commas = False
         self.__answer_display = None
         self.__answer_copy = None
+        self.__live_answer = False  # solves the answer while the user types
+        self.__answer_precision = 15  # significant digits of the approximate answer
 
     def save_settings(self, buttons: "list[QtWidgets.QPushButton]", settings_list: tuple) -> None:
         """
@@ -194,6 +219,8 @@ class Settings:
             for num in line:
                 defaults.append(int(num))
 
+            defaults += self.__default_settings()[len(defaults):]  # settings added after the file was saved use their defaults
+
             return defaults
 
         except Exception as error:
@@ -205,7 +232,7 @@ class Settings:
         Converts all settings to their default values.
         """
 
-        return [0, 0, 0, 2, 0, 0]
+        return [0, 0, 0, 2, 0, 0, 0]
 
     @property
     def primary_font_size(self) -> int:
@@ -512,6 +539,14 @@ class Settings:
     def answer_default(self, value: str) -> None:
         self.__answer_default = value
 
+    @property
+    def answer_computing(self) -> str:
+        return self.__answer_computing
+
+    @answer_computing.setter
+    def answer_computing(self, value: str) -> None:
+        self.__answer_computing = value
+
     @property
     def answer_format_font_size(self) -> int:
         return self.__answer_format_font_size
@@ -552,6 +587,54 @@ class Settings:
     def latex_image_dpi(self, value: int) -> None:
         self.__latex_image_dpi = value
 
+    @property
+    def answer_image_cache_size(self) -> int:
+        return self.__answer_image_cache_size
+
+    @answer_image_cache_size.setter
+    def answer_image_cache_size(self, value: int) -> None:
+        self.__answer_image_cache_size = value
+
+    @property
+    def live_answer_delay(self) -> int:
+        return self.__live_answer_delay
+
+    @live_answer_delay.setter
+    def live_answer_delay(self, value: int) -> None:
+        self.__live_answer_delay = value
+
+    @property
+    def solve_timeout(self) -> float:
+        return self.__solve_timeout
+
+    @solve_timeout.setter
+    def solve_timeout(self, value: float) -> None:
+        self.__solve_timeout = value
+
+    @property
+    def solve_max_exact_digits(self) -> int:
+        return self.__solve_max_exact_digits
+
+    @solve_max_exact_digits.setter
+    def solve_max_exact_digits(self, value: int) -> None:
+        self.__solve_max_exact_digits = value
+
+    @property
+    def solve_simplify_budget(self) -> float:
+        return self.__solve_simplify_budget
+
+    @solve_simplify_budget.setter
+    def solve_simplify_budget(self, value: float) -> None:
+        self.__solve_simplify_budget = value
+
+    @property
+    def solve_race_simplify(self) -> bool:
+        return self.__solve_race_simplify
+
+    @solve_race_simplify.setter
+    def solve_race_simplify(self, value: bool) -> None:
+        self.__solve_race_simplify = value
+
     @property
     def content_margin(self) -> int:
         return self.__content_margin
@@ -584,6 +667,110 @@ class Settings:
     def symbols_button_height(self, value: int) -> None:
         self.__symbols_button_height = value
 
+    @property
+    def heatmap_workers(self) -> int:
+        return self.__heatmap_workers
+
+    @heatmap_workers.setter
+    def heatmap_workers(self, value: int) -> None:
+        self.__heatmap_workers = value
+
+    @property
+    def heatmap_tile_pixels(self) -> int:
+        return self.__heatmap_tile_pixels
+
+    @heatmap_tile_pixels.setter
+    def heatmap_tile_pixels(self, value: int) -> None:
+        self.__heatmap_tile_pixels = value
+
+    @property
+    def heatmap_sizes(self) -> tuple[int, int]:
+        return self.__heatmap_sizes
+
+    @heatmap_sizes.setter
+    def heatmap_sizes(self, value: tuple[int, int]) -> None:
+        self.__heatmap_sizes = value
+
+    @property
+    def heatmap_cache_tiles(self) -> int:
+        return self.__heatmap_cache_tiles
+
+    @heatmap_cache_tiles.setter
+    def heatmap_cache_tiles(self, value: int) -> None:
+        self.__heatmap_cache_tiles = value
+
+    @property
+    def heatmap_contours(self) -> int:
+        return self.__heatmap_contours
+
+    @heatmap_contours.setter
+    def heatmap_contours(self, value: int) -> None:
+        self.__heatmap_contours = value
+
+    @property
+    def plot_samples(self) -> int:
+        return self.__plot_samples
+
+    @plot_samples.setter
+    def plot_samples(self, value: int) -> None:
+        self.__plot_samples = value
+
+    @property
+    def plot_max_depth(self) -> int:
+        return self.__plot_max_depth
+
+    @plot_max_depth.setter
+    def plot_max_depth(self, value: int) -> None:
+        self.__plot_max_depth = value
+
+    @property
+    def plot_tolerance(self) -> float:
+        return self.__plot_tolerance
+
+    @plot_tolerance.setter
+    def plot_tolerance(self, value: float) -> None:
+        self.__plot_tolerance = value
+
+    @property
+    def plot_cache_tiles(self) -> int:
+        return self.__plot_cache_tiles
+
+    @plot_cache_tiles.setter
+    def plot_cache_tiles(self, value: int) -> None:
+        self.__plot_cache_tiles = value
+
+    @property
+    def table_max_rows(self) -> int:
+        return self.__table_max_rows
+
+    @table_max_rows.setter
+    def table_max_rows(self, value: int) -> None:
+        self.__table_max_rows = value
+
+    @property
+    def table_block_size(self) -> int:
+        return self.__table_block_size
+
+    @table_block_size.setter
+    def table_block_size(self, value: int) -> None:
+        self.__table_block_size = value
+
+    @property
+    def table_cache_blocks(self) -> int:
+        return self.__table_cache_blocks
+
+    @table_cache_blocks.setter
+    def table_cache_blocks(self, value: int) -> None:
+        self.__table_cache_blocks = value
+
+    @property
+    def table_precision(self) -> int:
+        return self.__table_precision
+
+    @table_precision.setter
+    def table_precision(self, value: int) -> None:
+        self.__table_precision = value
+
     @property
     def radio_button_radius(self) -> int:
         return self.__radio_button_radius
@@ -808,6 +995,22 @@ class Settings:
     def answer_copy(self, value: str) -> None:
         self.__answer_copy = value
 
+    @property
+    def live_answer(self) -> bool:
+        return self.__live_answer
+
+    @live_answer.setter
+    def live_answer(self, value: bool) -> None:
+        self.__live_answer = value
+
+    @property
+    def answer_precision(self) -> int:
+        return self.__answer_precision
+
+    @answer_precision.setter
+    def answer_precision(self, value: int) -> None:
+        self.__answer_precision = value
+
 
 class Style:
     def __init__(self, settings: Settings):
@@ -1381,6 +1584,111 @@ class Style:
                 """
             )
 
+    def set_page_table(self, page: "PageTable") -> None:
+        page.setStyleSheet(
+            f"""
+            QLineEdit:active {{
+                selection-background-color: rgb{self.__settings.color_text_highlight_active};
+                selection-color: rgb{self.__settings.color_text};
+            }}
+            QLineEdit:!active {{
+                selection-background-color: rgb{self.__settings.color_text_highlight_inactive};
+                selection-color: rgb{self.__settings.color_text};
+            }}
+            QWidget {{
+                background-color: rgb{self.__settings.color_box_background};
+                color: rgb{self.__settings.color_text};
+                font-size: {self.__settings.primary_font_size}px;
+            }}
+            QComboBox, QLineEdit {{
+                border: {self.__settings.box_border}px solid rgb{self.__settings.color_box_border};
+                border-radius: {self.__settings.box_border_radius}px;
+            }}
+            QTableView {{
+                border: {self.__settings.box_border}px solid rgb{self.__settings.color_box_border};
+                gridline-color: rgb{self.__settings.color_line_secondary};
+            }}
+            QHeaderView::section {{
+                background-color: rgb{self.__settings.color_box_background};
+                border: none;
+                border-bottom: {self.__settings.box_border}px solid rgb{self.__settings.color_box_border};
+                font-weight: bold;
+            }}
+            QScrollBar:vertical {{
+                border-radius: {self.__settings.scrollbar_border_radius}px;
+                background-color: rgb{self.__settings.color_scrollbar_background};
+                width: {self.__settings.scrollbar_width}px;
+                margin: {self.__settings.scrollbar_margin[0]}px {self.__settings.scrollbar_margin[1]}px {self.__settings.scrollbar_margin[2]}px {self.__settings.scrollbar_margin[3]}px;
+            }}
+            QScrollBar::handle:vertical {{
+                background-color: rgb{self.__settings.color_box_border};
+                border-radius: {self.__settings.scrollbar_border_radius}px;
+                min-height: {self.__settings.scrollbar_min_height}px;
+            }}
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+                width: 0px;
+            }}
+            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{
+                background: none;
+            }}
+            """
+        )
+
+        self.set_label(page.label())
+        self.set_line_primary(page.line())
+
+        page.button().setStyleSheet(
+            f"""
+            QPushButton {{
+                border: {self.__settings.box_border}px solid rgb{self.__settings.color_box_border};
+                border-radius: {self.__settings.box_border_radius}px;
+                min-height: {self.__settings.bar_button_height}px;
+            }}
+            QPushButton:hover {{
+                background-color: rgb{self.__settings.color_box_hover};
+                padding-top: -{self.__settings.button_text_hover_raise}px;
+            }}
+            QPushButton:pressed {{
+                background-color: rgb{self.__settings.color_box_selected};
+            }}
+            """
+        )
+
+    def set_page_plot(self, page: "PagePlot") -> None:
+        page.setStyleSheet(
+            f"""
+            QWidget {{
+                background-color: rgb{self.__settings.color_box_background};
+                color: rgb{self.__settings.color_text};
+                font-size: {self.__settings.primary_font_size}px;
+            }}
+            """
+        )
+
+        self.set_label(page.label())
+        self.set_line_primary(page.line())
+
+        for button in page.buttons():
+            button.setStyleSheet(
+                f"""
+                QPushButton {{
+                    border: {self.__settings.box_border}px solid rgb{self.__settings.color_box_border};
+                    border-radius: {self.__settings.box_border_radius}px;
+                    min-height: {self.__settings.bar_button_height}px;
+                }}
+                QPushButton:hover {{
+                    background-color: rgb{self.__settings.color_box_hover};
+                    padding-top: -{self.__settings.button_text_hover_raise}px;
+                }}
+                QPushButton:pressed {{
+                    background-color: rgb{self.__settings.color_box_selected};
+                }}
+                """
+            )
+
+        page.plotWidget().setColors(self.__settings.color_box_background, self.__settings.color_line_secondary, self.__settings.color_box_border, self.__settings.color_latex)
+        page.heatmapWidget().setColors(self.__settings.color_box_background, self.__settings.color_box_border)
+
     def set_page_terms(self, page: "PageTerms") -> None:
         from ui.components.SectionConstants import SectionConstants
         from ui.components.SectionVariables import SectionVariables
@@ -1,3 +1,5 @@
+import sympy as sy
+
 from core.misc_functions import get_constant_values
 
 constants = {
@@ -8,6 +10,13 @@ constants = {
     'γ': ("EulerGamma",     "0.5772156649015328606065120900824024310421593359399235988057672348848677267776646709369470632917467495")
 }
 
+mpmath_constants = {  # the names of the constants in mpmath, used to compute their values with any amount of digits
+    'e': "e",
+    'π': "pi",
+    'φ': "phi",
+    'γ': "euler",
+}
+
 constants_terms = {  # labels for constants radio buttons
     'i': ('i'),
     'e': ('e',    "2.71..."),
@@ -97,7 +106,6 @@ subscript = {
     '(': '₍', ')': '₎'
 }
 
-constant_values = get_constant_values(constants, 20)  # amount of digits used for calculations
 constant_preview = get_constant_values(constants, 2)
 
 # used for checking the type of symbol / if they are allowed -------------------------------------
@@ -133,3 +141,10 @@ for i, key in enumerate(temp_key):
     constant_order[temp[key]] = i
 
 # ------------------------------------------------------------------------------------------------
+
+# sympy objects used when solving, created once so expressions are built without parsing text ----
+
+sympy_variables = {key: sy.Symbol(key) for key in accepted_variables}
+sympy_constants = {key: sy.sympify(constants[key][0]) for key in constants}
+
+# ------------------------------------------------------------------------------------------------
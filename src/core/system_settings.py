@@ -1,60 +1,8 @@
 import ctypes
-import io
-import os
-from PIL import Image
-import platform
 from PyQt6 import QtCore, QtGui
 import subprocess
 
-
-def get_system_info() -> tuple[str, str]:
-    """
-    Finds the OS name that the user is using.
-    """
-
-    name = platform.system()
-    version = None
-
-    # gets the version of Windows
-    if name == "Windows":
-        version = platform.version()
-        build_number = int(version.split('.')[2])
-
-        if build_number >= 10240:
-            version = "10"
-
-        elif build_number >= 22000:
-            version = "11"
-
-    return name, version
-
-
-system_name, system_version = get_system_info()  # gets the system name and version
-
-
-def get_data_path(file_name: str | None):
-    """
-    Used to get the path to files which need permissions to use.
-    """
-
-    app_name = "Calculator App"
-
-    if system_name == "Windows":
-        app_data_folder = os.path.join(os.environ["APPDATA"], app_name)
-        if not os.path.exists(app_data_folder):
-            os.makedirs(app_data_folder)
-
-    elif system_name == "Darwin":
-        home = os.path.expanduser('~')
-        app_data_folder = os.path.join(home, "Library", "Application Support", app_name)
-        if not os.path.exists(app_data_folder):
-            os.makedirs(app_data_folder)
-
-    else:
-        print("Folder not set.")
-        return None
-
-    return os.path.join(app_data_folder, file_name)
+from core.files import system_name, system_version
 
 
 class OperatingSystem:
@@ -119,26 +67,32 @@ class OperatingSystem:
 
         return radius
 
-    def copy_image(self, file_path):
+    def copy_image(self, image: QtGui.QImage):
         """
-        Copies a png image to the clipboard.
+        Copies an image to the clipboard.
         """
 
         if self.__system_name == "Windows":
 
             import win32clipboard as clp
 
-            image = Image.open(file_path)
-
             # converts the image to a png
-            output_png = io.BytesIO()
-            image.save(output_png, format="PNG")
-            png_data = output_png.getvalue()
-
-            # convert the image to DIB
-            output_dib = io.BytesIO()
-            image.convert("RGB").save(output_dib, format="BMP")
-            dib_data = output_dib.getvalue()[14:]  # skips the first 14 bytes which removes the header
+            buffer_png = QtCore.QBuffer()
+            buffer_png.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
+            image.save(buffer_png, "PNG")
+            png_data = bytes(buffer_png.data())
+
+            # convert the image to DIB, DIB has no transparency so the image is drawn over a black background
+            image_rgb = QtGui.QImage(image.size(), QtGui.QImage.Format.Format_RGB888)
+            image_rgb.fill(QtCore.Qt.GlobalColor.black)
+            painter = QtGui.QPainter(image_rgb)
+            painter.drawImage(0, 0, image)
+            painter.end()
+
+            buffer_bmp = QtCore.QBuffer()
+            buffer_bmp.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
+            image_rgb.save(buffer_bmp, "BMP")
+            dib_data = bytes(buffer_bmp.data())[14:]  # skips the first 14 bytes which removes the header
 
             # copies the png to the clipboard
             clp.OpenClipboard()
@@ -148,9 +102,8 @@ class OperatingSystem:
             clp.CloseClipboard()
 
         elif self.__system_name == "Darwin":
-            image = Image.open(file_path)
             output_path = "/tmp/temp_image.png"
-            image.save(output_path)
+            image.save(output_path, "PNG")
 
             # uses AppleScript to copy the image to the clipboard as a file reference
             script = f"set the clipboard to (read (POSIX file \"{output_path}\") as «class PNGf»)"
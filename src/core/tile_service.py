@@ -0,0 +1,108 @@
+import concurrent.futures
+import multiprocessing
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Hashable
+
+from PyQt6 import QtCore
+
+
+class TileService(QtCore.QObject):
+    """
+    Computes tiles on a pool of worker processes, emitting each tile once it is done.
+
+    Tiles that are no longer needed can be cancelled, which stops them if they have not started yet.
+    """
+
+    finished = QtCore.pyqtSignal(object, object)  # emitted with the key and value of a computed tile
+    failed = QtCore.pyqtSignal(object, str)  # emitted with the key and error message of a tile that could not be computed
+
+    def __init__(self, workers: int, parent: QtCore.QObject | None = None):
+        """
+        :param workers: The amount of worker processes.
+        """
+
+        super().__init__(parent)
+
+        self.__workers = workers
+        self.__executor: concurrent.futures.ProcessPoolExecutor | None = None  # started once the first tile is submitted
+        self.__pending: dict[Hashable, concurrent.futures.Future] = {}
+
+        # checks for finished tiles while some are pending
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.setInterval(15)
+        self.__timer.timeout.connect(self.__poll)
+
+    def submit(self, key: Hashable, function: Callable, *args) -> None:
+        """
+        Computes a tile, unless a tile with the same key is already pending.
+
+        Tiles are started in the order they are submitted.
+
+        :param key: Identifies the tile in the finished and failed signals.
+        :param function: A module level function that computes the tile.
+        :param args: The arguments passed to the function.
+        """
+
+        if key in self.__pending:
+            return
+
+        if self.__executor is None:
+            self.__executor = concurrent.futures.ProcessPoolExecutor(self.__workers, multiprocessing.get_context("spawn"))  # fork is not safe once Qt is running
+
+        self.__pending[key] = self.__executor.submit(function, *args)
+        self.__timer.start()
+
+    def is_pending(self, key: Hashable) -> bool:
+        return key in self.__pending
+
+    def retain(self, keys: set[Hashable]) -> None:
+        """
+        Cancels every pending tile that is not in keys, tiles that already started still finish.
+        """
+
+        for key in [key for key in self.__pending if key not in keys]:
+            if self.__pending[key].cancel():
+                del self.__pending[key]
+
+    def cancel(self) -> None:
+        """
+        Cancels every pending tile.
+        """
+
+        self.retain(set())
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes without waiting for running tiles.
+        """
+
+        self.__timer.stop()
+        self.__pending.clear()
+
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
+
+    def __poll(self) -> None:
+        """
+        Emits the tiles that finished.
+        """
+
+        for key, future in list(self.__pending.items()):
+            if not future.done() or self.__pending.get(key) is not future:  # the tile may have been cancelled by a signal emitted in this loop
+                continue
+
+            del self.__pending[key]
+
+            error = future.exception()
+            if error is None:
+                self.finished.emit(key, future.result())
+                continue
+
+            if isinstance(error, BrokenProcessPool):  # a worker stopped unexpectedly, a new pool is started for the next tiles
+                self.__executor = None
+
+            self.failed.emit(key, str(error))
+
+        if not self.__pending:
+            self.__timer.stop()
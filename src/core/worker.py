@@ -0,0 +1,108 @@
+import atexit
+import importlib
+import multiprocessing.context
+import os
+import signal
+import sys
+import threading
+from typing import Callable
+
+
+def function_worker(requests: multiprocessing.Queue, results: multiprocessing.Queue, ready) -> None:
+    """
+    Calls functions in a separate process until None is received.
+
+    Each request is a tuple of the request id, a module level function, and its arguments.
+    Each result is a tuple of the request id, the value returned by the function, and an error message.
+    """
+
+    ready.set()  # the modules of the functions are loaded as the requests are received
+
+    while True:
+        request = requests.get()
+        if request is None:
+            return
+
+        request_id, function, args = request
+
+        try:
+            results.put((request_id, function(*args), None))
+        except Exception as error:
+            results.put((request_id, None, str(error)))
+
+
+class Worker:
+    """
+    A worker process and the queues used to talk to it.
+    """
+
+    def __init__(self, context: multiprocessing.context.BaseContext, target: Callable = function_worker, preload: tuple[str, ...] = (), daemon: bool = True):
+        """
+        :param target: The function run by the process, it is given the request queue, the result queue, and the ready event.
+        :param preload: Modules imported before the process is ready, so the first request doesn't wait for them.
+        :param daemon: Daemon processes can't start processes of their own, a worker that is not a daemon is stopped once the program exits instead.
+        """
+
+        self.requests = context.Queue()
+        self.results = context.Queue()
+        self.ready = context.Event()
+
+        self.process = context.Process(target=run_worker, args=(target, preload, self.requests, self.results, self.ready), daemon=daemon)
+        self.process.start()  # begins loading the modules right away
+
+        if not daemon:
+            atexit.register(self.stop)  # the program would otherwise wait for the worker forever
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stops the worker process.
+
+        :param wait: If the process is waited on before returning, otherwise it is waited on by a background thread so the caller isn't blocked.
+        """
+
+        atexit.unregister(self.stop)
+
+        if not self.process.is_alive():
+            return
+
+        self.process.terminate()
+
+        if wait:
+            self.__reap()
+        else:
+            threading.Thread(target=self.__reap, daemon=True).start()
+
+    def __reap(self) -> None:
+        """
+        Waits for a stopped process to exit, killing it if it doesn't.
+        """
+
+        self.process.join(1)
+
+        if self.process.is_alive():  # the worker is stuck in a computation that can't be interrupted
+            self.process.kill()
+            self.process.join(1)
+
+
+def run_worker(target: Callable, preload: tuple[str, ...], requests: multiprocessing.Queue, results: multiprocessing.Queue, ready) -> None:
+    """
+    Imports the preloaded modules, then runs the worker function.
+
+    The worker exits once the process that started it stops, so stopping a worker also stops any workers it started.
+    """
+
+    parent = multiprocessing.parent_process()
+    threading.Thread(target=lambda: (parent.join(), os._exit(0)), daemon=True).start()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))  # exits normally when stopped, so the queues of any workers it started are cleaned up
+
+    for module in preload:
+        importlib.import_module(module)
+
+    target(requests, results, ready)
@@ -0,0 +1,353 @@
+import re
+from typing import Callable
+
+import sympy as sy
+
+from core.cache import LRUCache
+import core.parser as parser
+from core.solve import Solve, render_png, uncached_functions
+from core.solver import Solver
+import core.str_format as str_format
+import core.symbols as symbols
+
+
+assignment = re.compile(r"(?<![=<>!])=(?!=)")  # a single '=', which is not part of a comparison
+
+
+def is_worksheet(text: str) -> bool:
+    """
+    Returns if the text is a worksheet, which is any text with an assignment.
+    Text without an assignment is solved as a single expression, even if it spans many lines.
+    """
+
+    return assignment.search(text) is not None
+
+
+def read_line(line: str) -> tuple[str | None, str]:
+    """
+    Splits a line of a worksheet into the variable it assigns and its expression.
+
+    :return: The variable (None if the line is not an assignment), and the expression without whitespace.
+    """
+
+    parts = assignment.split(line)
+
+    if len(parts) == 1:
+        return None, str_format.remove_white_spaces(line)
+
+    if len(parts) > 2:
+        raise Exception("a line can only have one assignment")
+
+    name = str_format.remove_white_spaces(parts[0])
+    if name not in symbols.accepted_variables:
+        raise Exception(f"'{name}' can't be assigned, only variables can")
+
+    return name, str_format.remove_white_spaces(parts[1])
+
+
+class Worksheet:
+    """
+    Solves worksheets, where each line is an expression, or an assignment of a variable used by the lines below it.
+
+    The result of each line is kept, keyed by its text and the keys of the assignments it uses.
+    Editing a line only solves that line and the lines that depend on it again.
+    """
+
+    def __init__(self, session: Solver | None = None, cache_size: int = 1024):
+        """
+        :param session: The session each line is solved with.
+        :param cache_size: The amount of solved lines kept.
+        """
+
+        self.__session = session if session is not None else Solver()
+        self.__lines = LRUCache(cache_size)  # solved lines, keyed by their text and everything they depend on
+
+    def solve(self, expression: str, terms: dict[str, str] = dict(), is_cancelled: Callable[[], bool] = lambda: False, **kwargs) -> "WorksheetResult | None":
+        """
+        Solves every line of a worksheet, blank lines and lines starting with '#' are skipped.
+
+        :param terms: The definitions of the variables and constants, an assignment replaces a definition for the lines below it.
+        :param is_cancelled: Checked before each line, solving stops once it returns True.
+        :param kwargs: The other arguments passed to Solve.
+        :return: The result of each line, None if solving was cancelled.
+        """
+
+        context = (tuple(sorted(terms.items())), tuple(sorted(kwargs.items())))  # changes to these change the result of every line
+
+        assigned: dict[str, str] = {}  # the definitions assigned by the lines above
+        values: dict[str, sy.Basic] = {}  # the solved values of the assignments above, shared by every line that uses them
+        numbers: dict[str, int] = {}  # the line each variable is assigned on
+        keys: dict[str, tuple | None] = {}  # the key of each assignment, None if it could not be solved
+
+        entries = []
+        for number, line in enumerate(expression.splitlines(), start=1):
+            if line.strip() == '' or line.strip().startswith('#'):
+                continue
+
+            if is_cancelled():
+                return None
+
+            name, key, solve, error = None, None, None, None
+
+            try:
+                name, text = read_line(line)
+
+                if name in numbers:
+                    raise Exception(f"'{name}' is already assigned on line {numbers[name]}")
+
+                key = self.__key(name, text, terms, assigned, keys, context)
+
+                if key is None:
+                    solve = self.__solve(text, terms, assigned, values, kwargs)
+                else:
+                    solve = self.__lines.get_or_set(key, lambda: self.__solve(text, terms, assigned, values, kwargs))
+
+            except Exception as exception:
+                key = None
+                error = str(exception)
+
+            if name is not None and name not in numbers:
+                assigned[name] = text
+                numbers[name] = number
+                keys[name] = key
+
+                if solve is not None:
+                    values[name] = solve.get_solution()
+
+            entries.append((number, name, solve, error))
+
+        if not entries:
+            raise Exception("the worksheet has no lines")
+
+        return WorksheetResult(entries, **kwargs)
+
+    def __solve(self, expression: str, terms: dict[str, str], assigned: dict[str, str], values: dict[str, sy.Basic], kwargs: dict) -> Solve:
+        """
+        Solves a line using the values of the assignments above it.
+        Assignments that could not be solved are given as definitions, so the lines using them show the same error.
+        """
+
+        definitions = {name: text for name, text in assigned.items() if name not in values}
+        return self.__session.solve(expression, terms | definitions, values=values, **kwargs)
+
+    def __key(self, name: str | None, expression: str, terms: dict[str, str], assigned: dict[str, str], keys: dict[str, tuple | None], context: tuple) -> tuple | None:
+        """
+        Returns the key a line is kept with, made from its text and the keys of the assignments it uses.
+        Assignments used within the definitions of its terms are included.
+
+        :return: The key, None if the line is solved again every time since it uses a function like random, or an assignment that is not kept.
+        """
+
+        tree = self.__session.parse(expression)
+        if parser.find_functions(tree) & uncached_functions:
+            return None
+
+        used = set()
+        searched = set()
+        stack = list(parser.find_terms(tree))
+
+        while stack:
+            term = stack.pop()
+            if term in searched:
+                continue
+
+            searched.add(term)
+
+            if term in assigned:
+                if keys[term] is None:
+                    return None
+
+                used.add(term)  # the key of the assignment already covers everything it uses
+
+            elif terms.get(term, '').strip() != '':
+                definition = self.__session.parse(str_format.remove_white_spaces(terms[term]))
+                if parser.find_functions(definition) & uncached_functions:
+                    return None
+
+                stack.extend(parser.find_terms(definition))
+
+        return name, expression, tuple((term, keys[term]) for term in sorted(used)), context
+
+
+class WorksheetResult:
+    """
+    The solved lines of a worksheet, used in place of a Solve so they are shown together.
+
+    Each line is solved and rendered on its own, and the images of the lines are stacked into a single image.
+    """
+
+    def __init__(self, entries: list[tuple[int, str | None, Solve | None, str | None]], answer_display: str = "Image", answer_copy: str = "Text", use_commas: bool = False, render_color: tuple[int, int, int] = (255, 255, 255), render_dpi: int = 300, renderer: Callable = render_png, **kwargs):
+        """
+        :param entries: The line number, assigned variable, Solve, and error message of each line.
+        :param kwargs: The other arguments given to Solve, which only change how each line is solved.
+        """
+
+        self.__entries = entries
+
+        self.__answer_display = answer_display
+        self.__answer_copy = answer_copy
+        self.__use_commas = use_commas
+        self.__render_color = render_color
+        self.__render_dpi = render_dpi
+        self.__renderer = renderer
+
+        self.__renders: dict[str, tuple[tuple, bytes]] = {}  # the stacked image of each form, rendered the first time it is used
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state[f"_{self.__class__.__name__}__renders"] = self.__renders.copy()  # the worker may still be rendering while this is sent
+
+        return state
+
+    def __str__(self):
+        return '\n'.join(str(solve) if solve is not None else '' for _, _, solve, _ in self.__entries)
+
+    def get_summary(self) -> str:
+        """
+        Returns the summary of each line.
+        """
+
+        return '\n'.join(f"{number}: " + (solve.get_summary() if solve is not None else f"Error: {error}") for number, _, solve, error in self.__entries)
+
+    def get_lines(self) -> list[tuple[int, str | None, Solve | None, str | None]]:
+        """
+        Returns the line number, assigned variable, Solve, and error message of each line.
+        """
+
+        return self.__entries
+
+    def get_exact(self) -> str:
+        return self.__text("exact", Solve.get_exact, Solve.get_approximate)
+
+    def get_approximate(self) -> str:
+        return self.__text("approximate", Solve.get_approximate, Solve.get_approximate)
+
+    def get_exact_copy(self) -> str | bytes:
+        if self.__answer_copy == "Image" and not self.has_error():
+            return self.get_exact_image()
+
+        return self.__text("exact", Solve.get_exact_copy, Solve.get_approximate_copy)
+
+    def get_approximate_copy(self) -> str | bytes:
+        if self.__answer_copy == "Image" and not self.has_error():
+            return self.get_approximate_image()
+
+        return self.__text("approximate", Solve.get_approximate_copy, Solve.get_approximate_copy)
+
+    def get_exact_image(self) -> bytes | None:
+        return self.__render("exact")[1]
+
+    def get_approximate_image(self) -> bytes | None:
+        return self.__render("approximate")[1]
+
+    def get_exact_render_key(self) -> tuple | None:
+        return self.__render("exact")[0]
+
+    def get_approximate_render_key(self) -> tuple | None:
+        return self.__render("approximate")[0]
+
+    def get_initial_form(self) -> str:
+        return "approximate" if self.uses_constant_literal() else "exact"
+
+    def is_computed(self, form: str) -> bool:
+        """
+        Returns if the form of every line, and its stacked image, were already computed.
+        """
+
+        lines = all(solve.is_computed(form) for _, _, solve, _ in self.__entries if solve is not None)
+        return lines and (self.has_error() or "Image" not in (self.__answer_display, self.__answer_copy) or form in self.__renders)
+
+    def complete(self, is_cancelled: Callable[[], bool] = lambda: False) -> None:
+        """
+        Computes both forms of every line, stopping early once is_cancelled returns True.
+        """
+
+        for _, _, solve, _ in self.__entries:
+            if is_cancelled():
+                return
+
+            if solve is not None:
+                solve.complete(is_cancelled)
+
+        if is_cancelled():
+            return
+
+        self.__render("exact")
+        self.__render("approximate")
+
+    def is_text_used(self) -> bool:
+        """
+        Returns if text is used for the display, which is also used if any line has an error.
+        """
+
+        return self.__answer_display in ("Text", "LaTeX") or self.has_error()
+
+    def has_error(self) -> bool:
+        """
+        Returns if any line could not be solved.
+        """
+
+        return any(solve is None for _, _, solve, _ in self.__entries)
+
+    def get_warnings(self) -> list[str]:
+        """
+        Returns the warnings of every line, each starting with its line number.
+        """
+
+        return [f"line {number}: {warning}" for number, _, solve, _ in self.__entries if solve is not None for warning in solve.get_warnings()]
+
+    def uses_constant_literal(self) -> bool:
+        """
+        Returns True if no line has an exact form, since they all use a constant's literal value.
+        """
+
+        solves = [solve for _, _, solve, _ in self.__entries if solve is not None]
+        return len(solves) > 0 and all(solve.uses_constant_literal() for solve in solves)
+
+    def __text(self, form: str, getter: Callable[[Solve], str], fallback: Callable[[Solve], str]) -> str:
+        """
+        Joins the lines of a form, lines without an exact form use their approximate form.
+
+        :param getter: Returns the text of a line.
+        :param fallback: Returns the text of a line without an exact form.
+        """
+
+        lines = []
+        for number, name, solve, error in self.__entries:
+            if solve is None:
+                lines.append(f"Error on line {number}: {error}")
+                continue
+
+            text = fallback(solve) if form == "exact" and solve.uses_constant_literal() else getter(solve)
+            lines.append(text if name is None else f"{name} = {text}")
+
+        return '\n'.join(lines)
+
+    def __render(self, form: str) -> tuple[tuple | None, bytes | None]:
+        """
+        Renders each line of a form, and stacks the images of the lines.
+
+        :return: The key of the stacked image, and its png bytes.
+        """
+
+        if self.has_error() or "Image" not in (self.__answer_display, self.__answer_copy):  # lines with errors are only shown as text
+            return None, None
+
+        if form not in self.__renders:
+            from core.latex import stack_images  # matplotlib is only imported once an image is rendered
+
+            keys = []
+            images = []
+            for _, name, solve, _ in self.__entries:
+                answer = solve.get_answer("approximate" if form == "exact" and solve.uses_constant_literal() else form)
+
+                if name is not None:
+                    answer = sy.Eq(symbols.sympy_variables[name], answer, evaluate=False)
+
+                key, png = self.__renderer(answer, self.__use_commas, self.__render_color, self.__render_dpi)
+                keys.append(key)
+                images.append(png)
+
+            self.__renders[form] = ("worksheet", *keys), stack_images(images)
+
+        return self.__renders[form]
@@ -1,6 +1,9 @@
+import multiprocessing
+
 from ui.views.RunWindow import RunWindow
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # lets the solver's worker process start in a packaged app
     app = RunWindow()
     app.start()
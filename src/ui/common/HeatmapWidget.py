@@ -0,0 +1,170 @@
+import numpy as np
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from core.cache import LRUCache
+from core.heatmap import colorize, evaluate_tile, round_range, tile_bounds, tile_level, visible_tiles
+from core.tile_service import TileService
+from ui.common.ViewWidget import ViewWidget
+
+
+class HeatmapWidget(ViewWidget):
+    """
+    Shows the values of an expression of two variables as colors, with contour lines, the view can be panned and zoomed.
+
+    The view is split into tiles that are evaluated on worker processes, first at a coarse resolution and then at the full resolution.
+    Tiles that leave the view before they start are cancelled, and computed tiles are kept so returning to them is instant.
+    """
+
+    failed = QtCore.pyqtSignal(str)  # emitted with the error message when a tile can't be evaluated
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None, workers: int = 2, tilePixels: int = 256, coarseSize: int = 32, fineSize: int = 256, cacheTiles: int = 512, contours: int = 10) -> None:
+        """
+        :param workers: The amount of worker processes evaluating tiles.
+        :param tilePixels: The largest width of a tile on screen.
+        :param coarseSize: The amount of samples along each side of a tile in the first pass.
+        :param fineSize: The amount of samples along each side of a tile in the final pass.
+        :param cacheTiles: The amount of evaluated tiles kept.
+        :param contours: The amount of contour lines between the lowest and highest visible values.
+        """
+
+        super().__init__(parent)
+
+        self.__tilePixels = tilePixels
+        self.__sizes = coarseSize, fineSize
+        self.__contours = contours
+
+        self.__tiles = LRUCache(cacheTiles)  # values of evaluated tiles, keyed by expression, level, column, row, and size
+        self.__images = LRUCache(cacheTiles)  # colored tiles, keyed by the tile key and the rounded range of colors
+
+        self.__expression: str | None = None
+        self.__terms: dict[str, str] = {}
+        self.__variables = ('x', 'y')
+        self.__expressionKey = 0
+        self.__isFailed = False
+
+        self.__service = TileService(workers, self)
+        self.__service.finished.connect(self.__tileFinished)
+        self.__service.failed.connect(self.__tileFailed)
+
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.__service.shutdown)
+
+        self.__colorBackground = QtGui.QColor(0, 0, 0)
+
+    def setExpression(self, expression: str | None, terms: dict[str, str] | None = None, variables: tuple[str, str] = ('x', 'y')) -> None:
+        """
+        Sets the expression that is shown, tiles of the previous expression that have not started are cancelled.
+
+        :param expression: The expression, or None to show nothing.
+        :param terms: The definitions of the variables and constants, the two shown variables are left blank.
+        :param variables: The names of the horizontal and vertical variables.
+        """
+
+        self.__expression = expression
+        self.__terms = dict(terms or {})
+        self.__variables = variables
+        self.__expressionKey = hash((expression, tuple(sorted(self.__terms.items())), variables))
+        self.__isFailed = False
+
+        self.__service.cancel()
+        self._viewChanged()
+
+    def setColors(self, background: tuple[int, int, int], axis: tuple[int, int, int]) -> None:
+        self.__colorBackground = QtGui.QColor(*background)
+        self._colorAxis = QtGui.QColor(*axis)
+        self.update()
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes.
+        """
+
+        self.__service.shutdown()
+
+    def _viewChanged(self) -> None:
+        """
+        Evaluates the tiles that became visible, and cancels the tiles that are no longer visible.
+        """
+
+        self.update()
+
+        if self.__expression is None or self.__isFailed:
+            return
+
+        keys = [self.__tileKey(level, column, row, size) for size in self.__sizes for level, column, row in self.__visibleTiles()]  # every coarse tile is queued before the fine tiles
+        self.__service.retain(set(keys))
+
+        for key in keys:
+            if key not in self.__tiles:
+                level, column, row, size = key[1:]
+                self.__service.submit(key, evaluate_tile, self.__expression, self.__terms, self.__variables, tile_bounds(level, column, row), size)
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), self.__colorBackground)
+
+        if self.__expression is not None:
+            self.__paintTiles(painter)
+
+        self._paintGrid(painter, lines=False)
+        painter.end()
+
+    def __visibleTiles(self) -> list[tuple[int, int, int]]:
+        level = tile_level(self._scale, self.__tilePixels)
+        return [(level, column, row) for column, row in visible_tiles(self.view(), level)]
+
+    def __tileKey(self, level: int, column: int, row: int, size: int) -> tuple:
+        return self.__expressionKey, level, column, row, size
+
+    def __paintTiles(self, painter: QtGui.QPainter) -> None:
+        """
+        Draws the most detailed evaluated version of each visible tile.
+        """
+
+        tiles = []
+        for level, column, row in self.__visibleTiles():
+            for size in reversed(self.__sizes):
+                key = self.__tileKey(level, column, row, size)
+                values = self.__tiles.get(key)
+
+                if values is not None:
+                    tiles.append((key, values))
+                    break
+
+        if not tiles:
+            return
+
+        # the colors span the visible values, ignoring the most extreme values
+        # the range is rounded, so panning and zooming a little reuses the colored tiles instead of coloring every tile again
+        sample = np.concatenate([values[::4, ::4].ravel() for key, values in tiles])
+        sample = sample[np.isfinite(sample)]
+        low, high = round_range(*(float(value) for value in np.percentile(sample, (1, 99)))) if sample.size else (0.0, 1.0)
+
+        painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+        xMin, xMax, yMin, yMax = self.view()
+
+        for key, values in tiles:
+            image = self.__images.get_or_set((key, low, high), lambda: self.__toImage(values, low, high))
+
+            tileXMin, tileXMax, tileYMin, tileYMax = tile_bounds(*key[1:4])
+            target = QtCore.QRectF((tileXMin - xMin) / self._scale, (yMax - tileYMax) / self._scale, (tileXMax - tileXMin) / self._scale, (tileYMax - tileYMin) / self._scale)
+            painter.drawImage(target, image)
+
+    def __toImage(self, values: np.ndarray, low: float, high: float) -> QtGui.QImage:
+        pixels = np.ascontiguousarray(colorize(values, low, high, self.__contours))
+        height, width = values.shape
+
+        return QtGui.QImage(pixels.data, width, height, width * 4, QtGui.QImage.Format.Format_RGBA8888).copy()  # copies the pixels, so the image doesn't depend on the array
+
+    def __tileFinished(self, key: tuple, values: np.ndarray) -> None:
+        self.__tiles.set(key, values)
+
+        if key[0] == self.__expressionKey:
+            self.update()
+
+    def __tileFailed(self, key: tuple, error: str) -> None:
+        if key[0] != self.__expressionKey or self.__isFailed:
+            return
+
+        self.__isFailed = True  # the other tiles fail the same way
+        self.__service.cancel()
+        self.failed.emit(error)
@@ -0,0 +1,95 @@
+from typing import Callable
+
+import numpy as np
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from core.cache import LRUCache
+from core.plot import adaptive_sample, tile_range
+from ui.common.ViewWidget import ViewWidget
+
+
+class PlotWidget(ViewWidget):
+    """
+    Graphs a function of one variable, the view can be panned by dragging and zoomed with the scroll wheel.
+
+    The function is sampled in tiles whose width depends on the zoom, and the samples of each tile are kept, so panning back to a tile never samples it again.
+    """
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None, samples: int = 32, maxDepth: int = 6, tolerance: float = 1 / 500, cacheTiles: int = 256) -> None:
+        """
+        :param samples: The amount of evenly spaced samples in each tile before more are added where the function curves.
+        :param maxDepth: The most times an interval of a tile can be split.
+        :param tolerance: The largest error of the drawn line, as a fraction of a tile's width.
+        :param cacheTiles: The amount of sampled tiles kept.
+        """
+
+        super().__init__(parent)
+
+        self.__samples = samples
+        self.__maxDepth = maxDepth
+        self.__tolerance = tolerance
+        self.__tiles = LRUCache(cacheTiles)  # samples of the function, keyed by tile level and index
+
+        self.__function: Callable[[np.ndarray], np.ndarray] | None = None
+
+        self.__colorBackground = QtGui.QColor(0, 0, 0)
+        self.__colorCurve = QtGui.QColor(255, 255, 255)
+
+    def setFunction(self, function: Callable[[np.ndarray], np.ndarray] | None) -> None:
+        """
+        Sets the function that is graphed, removing the samples of the previous function.
+
+        :param function: Evaluates an array of inputs, returning an array of real values (NaN where the function is undefined).
+        """
+
+        self.__function = function
+        self.__tiles.clear()
+        self.update()
+
+    def setColors(self, background: tuple[int, int, int], grid: tuple[int, int, int], axis: tuple[int, int, int], curve: tuple[int, int, int]) -> None:
+        self.__colorBackground = QtGui.QColor(*background)
+        self._colorGrid = QtGui.QColor(*grid)
+        self._colorAxis = QtGui.QColor(*axis)
+        self.__colorCurve = QtGui.QColor(*curve)
+        self.update()
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), self.__colorBackground)
+
+        self._paintGrid(painter)
+
+        if self.__function is not None:
+            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+            painter.setPen(QtGui.QPen(self.__colorCurve, 2))
+            self.__paintCurve(painter)
+
+        painter.end()
+
+    def __paintCurve(self, painter: QtGui.QPainter) -> None:
+        """
+        Draws the function, tile by tile.
+        """
+
+        xMin, xMax, yMin, yMax = self.view()
+        level, first, last = tile_range(xMin, xMax)
+        width = 2.0 ** level
+
+        for index in range(first, last + 1):
+            xs, ys = self.__tiles.get_or_set((level, index), lambda: self.__sampleTile(index * width, (index + 1) * width, width))
+
+            px = (xs - xMin) / self._scale
+            py = np.clip((yMax - ys) / self._scale, -4 * self.height(), 5 * self.height())  # keeps far away points within what the painter can draw
+
+            # breaks the line where the function is undefined, or jumps across the view (asymptotes)
+            breaks = ~np.isfinite(py[:-1]) | ~np.isfinite(py[1:])
+            breaks |= ((py[:-1] < 0) & (py[1:] > self.height())) | ((py[:-1] > self.height()) & (py[1:] < 0))
+
+            start = 0
+            for end in [*(np.flatnonzero(breaks) + 1), len(px)]:
+                if end - start > 1 and np.isfinite(py[start:end]).all():
+                    painter.drawPolyline(QtGui.QPolygonF([QtCore.QPointF(x, y) for x, y in zip(px[start:end], py[start:end])]))
+                start = end
+
+    def __sampleTile(self, start: float, stop: float, width: float) -> tuple[np.ndarray, np.ndarray]:
+        return adaptive_sample(self.__function, start, stop, width * self.__tolerance, self.__samples, self.__maxDepth)
@@ -0,0 +1,134 @@
+from typing import Callable
+
+import numpy as np
+from PyQt6 import QtCore
+
+from core.cache import LRUCache
+
+
+class ValueTableModel(QtCore.QAbstractTableModel):
+    """
+    A table of evenly spaced inputs and the values of a function at those inputs.
+
+    Values are only computed for the rows the view asks for, a block of rows at a time, so the table can have millions of rows.
+    """
+
+    def __init__(self, parent: QtCore.QObject | None = None, blockSize: int = 1024, cacheBlocks: int = 64, precision: int = 10) -> None:
+        """
+        :param blockSize: The amount of rows computed at once.
+        :param cacheBlocks: The amount of computed blocks kept.
+        :param precision: The amount of significant digits shown.
+        """
+
+        super().__init__(parent)
+
+        self.__blockSize = blockSize
+        self.__blocks = LRUCache(cacheBlocks)  # computed values, keyed by block number
+        self.__precision = precision
+
+        self.__function: Callable[[np.ndarray], np.ndarray] | None = None
+        self.__start = 0.0
+        self.__step = 1.0
+        self.__count = 0
+        self.__headers = ('', '')
+
+    def setSweep(self, function: Callable[[np.ndarray], np.ndarray], start: float, step: float, count: int, headers: tuple[str, str]) -> None:
+        """
+        Replaces the table with a new sweep.
+
+        :param function: Evaluates an array of inputs, returning an array of values with the same shape.
+        :param start: The first input.
+        :param step: The distance between inputs.
+        :param count: The amount of rows.
+        :param headers: The labels of the input and value columns.
+        """
+
+        self.beginResetModel()
+
+        self.__function = function
+        self.__start = start
+        self.__step = step
+        self.__count = count
+        self.__headers = headers
+        self.__blocks.clear()
+
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """
+        Removes every row.
+        """
+
+        self.beginResetModel()
+
+        self.__function = None
+        self.__count = 0
+        self.__blocks.clear()
+
+        self.endResetModel()
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.__count
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            return self.__headers[section]
+
+        return str(section + 1)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
+            return QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter
+
+        if role != QtCore.Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        row = index.row()
+
+        if index.column() == 0:
+            return self.__format(self.__start + row * self.__step)
+
+        block, offset = divmod(row, self.__blockSize)
+        return self.__format(self.__blocks.get_or_set(block, lambda: self.__computeBlock(block))[offset])
+
+    def __computeBlock(self, block: int) -> np.ndarray:
+        """
+        Computes the values of every row in a block with a single call to the function.
+        """
+
+        first = block * self.__blockSize
+        rows = np.arange(first, min(first + self.__blockSize, self.__count))
+
+        try:
+            return np.broadcast_to(self.__function(self.__start + rows * self.__step), rows.shape)
+        except Exception:
+            return np.full(rows.shape, np.nan)
+
+    def __format(self, value) -> str:
+        """
+        Formats a value using the amount of significant digits of the table.
+        """
+
+        if isinstance(value, (bool, np.bool_)):
+            return str(bool(value))
+
+        value = complex(value)
+
+        if not np.isfinite(value):
+            return "undefined"
+
+        real = f"{value.real:.{self.__precision}g}"
+        if value.imag == 0:
+            return real
+
+        imag = f"{abs(value.imag):.{self.__precision}g}i"
+        if value.real == 0:
+            return imag if value.imag > 0 else '-' + imag
+
+        return f"{real} {'+' if value.imag > 0 else '-'} {imag}"
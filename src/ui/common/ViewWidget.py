@@ -0,0 +1,149 @@
+import math
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class ViewWidget(QtWidgets.QWidget):
+    """
+    A view of the xy plane that can be panned by dragging and zoomed with the scroll wheel, both axes use the same scale.
+
+    Subclasses draw their content in paintEvent, and can override _viewChanged to react to the view moving.
+    """
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None, span: float = 20) -> None:
+        """
+        :param span: The range of x values shown when the view is reset.
+        """
+
+        super().__init__(parent)
+
+        self.__span = span
+
+        self._center = QtCore.QPointF(0, 0)
+        self._scale = span / max(self.width(), 1)  # units per pixel
+        self.__dragStart: QtCore.QPointF | None = None
+
+        self._colorGrid = QtGui.QColor(64, 64, 64)
+        self._colorAxis = QtGui.QColor(128, 128, 128)
+
+        self.setMinimumSize(100, 100)
+        self.setCursor(QtCore.Qt.CursorShape.OpenHandCursor)
+
+    def resetView(self) -> None:
+        """
+        Centers the view on the origin.
+        """
+
+        self._center = QtCore.QPointF(0, 0)
+        self._scale = self.__span / max(self.width(), 1)
+        self._viewChanged()
+
+    def view(self) -> tuple[float, float, float, float]:
+        """
+        Returns the visible area as (x min, x max, y min, y max).
+        """
+
+        halfWidth = self.width() * self._scale / 2
+        halfHeight = self.height() * self._scale / 2
+
+        return self._center.x() - halfWidth, self._center.x() + halfWidth, self._center.y() - halfHeight, self._center.y() + halfHeight
+
+    def _viewChanged(self) -> None:
+        """
+        Called after the view is panned, zoomed, resized, or reset.
+        """
+
+        self.update()
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        """
+        Keeps the same range of x values visible.
+        """
+
+        if event.oldSize().width() > 0:
+            self._scale *= event.oldSize().width() / max(self.width(), 1)
+        else:
+            self._scale = self.__span / max(self.width(), 1)
+
+        self._viewChanged()
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
+        if event.button() == QtCore.Qt.MouseButton.LeftButton:
+            self.__dragStart = event.position()
+            self.setCursor(QtCore.Qt.CursorShape.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
+        if self.__dragStart is None:
+            return
+
+        delta = event.position() - self.__dragStart
+        self.__dragStart = event.position()
+
+        self._center = QtCore.QPointF(self._center.x() - delta.x() * self._scale, self._center.y() + delta.y() * self._scale)
+        self._viewChanged()
+
+    def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
+        self.__dragStart = None
+        self.setCursor(QtCore.Qt.CursorShape.OpenHandCursor)
+
+    def wheelEvent(self, event: QtGui.QWheelEvent) -> None:
+        """
+        Zooms around the cursor.
+        """
+
+        factor = 0.8 ** (event.angleDelta().y() / 120)
+        position = event.position()
+
+        # keeps the point under the cursor in place
+        xMin, xMax, yMin, yMax = self.view()
+        x, y = xMin + position.x() * self._scale, yMax - position.y() * self._scale
+        self._scale *= factor
+        self._center = QtCore.QPointF(x - (position.x() - self.width() / 2) * self._scale, y + (position.y() - self.height() / 2) * self._scale)
+
+        self._viewChanged()
+
+    def _paintGrid(self, painter: QtGui.QPainter, lines: bool = True) -> None:
+        """
+        Draws grid lines at evenly spaced round numbers, and the labeled axes.
+
+        :param lines: If the grid lines are drawn, otherwise only the axes are drawn.
+        """
+
+        xMin, xMax, yMin, yMax = self.view()
+
+        # the spacing is 1, 2, or 5 times a power of ten, at least 80 pixels apart
+        spacing = 80 * self._scale
+        power = 10 ** math.floor(math.log10(spacing))
+        spacing = next(power * step for step in (1, 2, 5, 10) if power * step >= spacing)
+
+        columns = range(math.ceil(xMin / spacing), math.floor(xMax / spacing) + 1)
+        rows = range(math.ceil(yMin / spacing), math.floor(yMax / spacing) + 1)
+
+        if lines:
+            painter.setPen(QtGui.QPen(self._colorGrid, 1))
+            for i in columns:
+                px = (i * spacing - xMin) / self._scale
+                painter.drawLine(QtCore.QLineF(px, 0, px, self.height()))
+
+            for i in rows:
+                py = (yMax - i * spacing) / self._scale
+                painter.drawLine(QtCore.QLineF(0, py, self.width(), py))
+
+        # axes, with labels kept inside the widget when an axis is off screen
+        axisX = min(max((0 - xMin) / self._scale, 0), self.width() - 1)
+        axisY = min(max((yMax - 0) / self._scale, 0), self.height() - 1)
+
+        painter.setPen(QtGui.QPen(self._colorAxis, 1))
+        painter.drawLine(QtCore.QLineF(axisX, 0, axisX, self.height()))
+        painter.drawLine(QtCore.QLineF(0, axisY, self.width(), axisY))
+
+        metrics = painter.fontMetrics()
+        for i in columns:
+            if i != 0:
+                label = f"{i * spacing:g}"
+                painter.drawText(QtCore.QPointF((i * spacing - xMin) / self._scale + 2, min(axisY + metrics.ascent() + 2, self.height() - metrics.descent())), label)
+
+        for i in rows:
+            if i != 0:
+                label = f"{i * spacing:g}"
+                painter.drawText(QtCore.QPointF(min(axisX + 2, self.width() - metrics.horizontalAdvance(label)), (yMax - i * spacing) / self._scale - 2), label)
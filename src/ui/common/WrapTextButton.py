@@ -106,6 +106,13 @@ class WrapTextButton:
 
         self.__button.setCursor(cursor)
 
+    def setToolTip(self, text: str) -> None:
+        """
+        Sets the text which appears when hovering over the button.
+        """
+
+        self.__button.setToolTip(text)
+
     def move(self, x: int, y: int) -> None:
         """
         Moves the buttons to the given x and y position.
@@ -0,0 +1,223 @@
+from typing import Callable
+
+import numpy as np
+from PyQt6 import QtCore, QtWidgets
+
+from core.batch_solve import BatchSolve
+from core.solve import Solve
+from core.solve_service import SolveService
+from core.solver import Solver
+from ui.common.CaretLineEdit import CaretLineEdit
+from ui.common.CaretTextEdit import CaretTextEdit
+from ui.common.HeatmapWidget import HeatmapWidget
+from ui.common.PlotWidget import PlotWidget
+
+
+class PagePlot(QtWidgets.QFrame):
+    """
+    A page that graphs the expression in one variable, or shows it as a heatmap in two variables.
+    """
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None, edit: CaretLineEdit | CaretTextEdit | None = None, terms: Callable[[], dict[str, str]] | None = None, solver: Solver | None = None, service: SolveService | None = None, samples: int = 32, maxDepth: int = 6, tolerance: float = 1 / 500, cacheTiles: int = 256, heatmapWorkers: int = 2, heatmapTilePixels: int = 256, heatmapSizes: tuple[int, int] = (32, 256), heatmapCacheTiles: int = 512, heatmapContours: int = 10) -> None:
+        """
+        :param edit: The edit widget holding the expression.
+        :param terms: Returns the current definitions of the variables and constants.
+        :param solver: The session the expression is compiled with, so graphing the same expression again is instant.
+        :param service: Solves expressions that were not compiled before, it can be shared with other pages.
+
+        Expressions that were not compiled before are solved by the service, so the window stays responsive while they are simplified.
+        """
+
+        super().__init__(parent)
+
+        self.__edit = edit
+        self.__terms = terms if terms is not None else dict
+        self.__solver = solver if solver is not None else Solver()
+
+        self.__service = service if service is not None else SolveService(parent=self, preload=False)
+        self.__service.finished.connect(self.__solved)
+        self.__service.failed.connect(self.__failed)
+        self.__requestId: int | None = None  # the request of this page being solved, the service can be shared with other pages
+        self.__pending: tuple[str, dict[str, str]] | None = None  # the expression and terms waiting to be solved
+
+        self.__plot = PlotWidget(None, samples, maxDepth, tolerance, cacheTiles)
+        self.__heatmap = HeatmapWidget(None, heatmapWorkers, heatmapTilePixels, *heatmapSizes, heatmapCacheTiles, heatmapContours)
+        self.__heatmap.failed.connect(lambda error: self.__status.setText(f"Error: {error}"))
+
+        self.initUi()
+
+    def initUi(self) -> None:
+        """
+        Initializes the UI components.
+        """
+
+        self.setLayout(QtWidgets.QVBoxLayout())
+
+        # add title
+        self.__label = QtWidgets.QLabel("Plot")
+        self.layout().addWidget(self.__label)
+
+        # add line under title
+        self.__line = QtWidgets.QFrame()
+        self.__line.setFrameShape(QtWidgets.QFrame.Shape.HLine)
+        self.__line.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
+        self.layout().addWidget(self.__line)
+
+        self.__buttons: list[QtWidgets.QPushButton] = []
+        buttonLayout = QtWidgets.QHBoxLayout()
+        for text, function in (("Plot", self.plot), ("Reset View", self.resetView)):
+            button = QtWidgets.QPushButton(text)
+            button.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
+            button.clicked.connect(function)
+            buttonLayout.addWidget(button)
+            self.__buttons.append(button)
+        self.layout().addLayout(buttonLayout)
+
+        self.__status = QtWidgets.QLabel('')  # shows errors and the variable being graphed
+        self.__status.setWordWrap(True)
+        self.layout().addWidget(self.__status)
+
+        # shows the graph or the heatmap
+        self.__stackedWidget = QtWidgets.QStackedWidget()
+        self.__stackedWidget.addWidget(self.__plot)
+        self.__stackedWidget.addWidget(self.__heatmap)
+        self.layout().addWidget(self.__stackedWidget)
+        self.layout().setStretchFactor(self.__stackedWidget, 1)
+
+    def label(self) -> QtWidgets.QLabel:
+        """
+        Returns the label widget.
+        """
+
+        return self.__label
+
+    def line(self) -> QtWidgets.QFrame:
+        """
+        Returns the line widget.
+        """
+
+        return self.__line
+
+    def buttons(self) -> list[QtWidgets.QPushButton]:
+        """
+        Returns the plot and reset view buttons.
+        """
+
+        return self.__buttons
+
+    def plotWidget(self) -> PlotWidget:
+        """
+        Returns the widget the graph is drawn in.
+        """
+
+        return self.__plot
+
+    def heatmapWidget(self) -> HeatmapWidget:
+        """
+        Returns the widget the heatmap is drawn in.
+        """
+
+        return self.__heatmap
+
+    def resetView(self) -> None:
+        self.__stackedWidget.currentWidget().resetView()
+
+    def plot(self) -> None:
+        """
+        Compiles the expression and graphs it, expressions of two variables are shown as a heatmap.
+        Expressions that were not compiled before are solved in the background first.
+        """
+
+        text = self.__edit.toPlainText() if isinstance(self.__edit, CaretTextEdit) else self.__edit.text()
+        terms = self.__terms()
+
+        if self.__solver.is_compiled(text, terms):
+            self.__pending = None
+            self.__show(text, terms, self.__solver.compile(text, terms))
+            return
+
+        self.__pending = text, terms
+        self.__status.setText("Compiling...")
+        self.__requestId = self.__service.submit(expression=text, terms=terms, answer_display="Text", answer_copy="Text")
+
+    def __solved(self, solve: Solve) -> None:
+        if not self.__isRequestFinished():
+            return
+
+        text, terms = self.__pending
+        self.__pending = None
+
+        try:
+            batch = self.__solver.compile(text, terms, solution=solve.get_solution())
+        except Exception as error:
+            self.__showError(str(error))
+            return
+
+        self.__show(text, terms, batch)
+
+    def __failed(self, error: str) -> None:
+        if self.__isRequestFinished():
+            self.__showError(error)
+
+    def __isRequestFinished(self) -> bool:
+        """
+        Returns if a result of the service is for the request of this page.
+        A request replaced by a request of another page is dropped, and calculating again solves it.
+        """
+
+        if self.__requestId is None:
+            return False
+
+        if self.__requestId != self.__service.get_request_id():
+            self.__pending = None
+            self.__status.setText('')
+
+        self.__requestId = None
+        return self.__pending is not None
+
+    def __showError(self, error: str) -> None:
+        self.__pending = None
+        self.__plot.setFunction(None)
+        self.__heatmap.setExpression(None)
+        self.__status.setText(f"Error: {error}")
+
+    def __show(self, text: str, terms: dict[str, str], batch: BatchSolve) -> None:
+        """
+        Graphs the compiled expression, or shows it as a heatmap if it has two variables.
+        """
+
+        variables = batch.get_variables()
+
+        if len(variables) > 2:
+            self.__showError(f"at most two variables can be graphed, but the expression uses {', '.join(variables)}")
+            return
+
+        if len(variables) == 2:
+            self.__plot.setFunction(None)
+            self.__heatmap.setExpression(text, terms, (variables[0], variables[1]))
+            self.__stackedWidget.setCurrentWidget(self.__heatmap)
+            self.__status.setText(f"z = {text.strip()}, over {variables[0]} and {variables[1]}")
+            return
+
+        self.__heatmap.setExpression(None)
+        self.__stackedWidget.setCurrentWidget(self.__plot)
+
+        variable = variables[0] if variables else 'x'
+
+        def function(xs: np.ndarray) -> np.ndarray:
+            """
+            Evaluates the expression numerically, values that are not real are not drawn.
+            """
+
+            try:
+                ys = np.broadcast_to(batch.evaluate({variable: xs}, exact_fallback=False), xs.shape)
+            except Exception:
+                return np.full(xs.shape, np.nan)
+
+            if np.iscomplexobj(ys):
+                ys = np.where(ys.imag == 0, ys.real, np.nan)
+
+            return ys.astype(float)
+
+        self.__plot.setFunction(function)
+        self.__status.setText(f"y = {text.strip()}, graphed over {variable}")
@@ -0,0 +1,249 @@
+import math
+from typing import Callable
+
+from PyQt6 import QtCore, QtWidgets
+
+from core.batch_solve import BatchSolve
+from core.solve import Solve
+from core.solve_service import SolveService
+from core.solver import Solver
+import core.symbols as symbols
+from ui.common.CaretLineEdit import CaretLineEdit
+from ui.common.CaretTextEdit import CaretTextEdit
+from ui.common.ValueTableModel import ValueTableModel
+
+
+class PageTable(QtWidgets.QFrame):
+    """
+    A page that shows a table of the expression's values as one variable is swept from a start to a stop value.
+    """
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None, edit: CaretLineEdit | CaretTextEdit | None = None, terms: Callable[[], dict[str, str]] | None = None, solver: Solver | None = None, service: SolveService | None = None, maxRows: int = 10_000_000, blockSize: int = 1024, cacheBlocks: int = 64, precision: int = 10) -> None:
+        """
+        :param edit: The edit widget holding the expression.
+        :param terms: Returns the current definitions of the variables and constants.
+        :param solver: The session the expression is compiled with, so compiling the same expression again is instant.
+        :param service: Solves expressions that were not compiled before, it can be shared with other pages.
+        :param maxRows: The largest amount of rows a table can have.
+
+        Expressions that were not compiled before are solved by the service, so the window stays responsive while they are simplified.
+        """
+
+        super().__init__(parent)
+
+        self.__edit = edit
+        self.__terms = terms if terms is not None else dict
+        self.__solver = solver if solver is not None else Solver()
+        self.__maxRows = maxRows
+
+        self.__model = ValueTableModel(self, blockSize, cacheBlocks, precision)
+
+        self.__service = service if service is not None else SolveService(parent=self, preload=False)
+        self.__service.finished.connect(self.__solved)
+        self.__service.failed.connect(self.__failed)
+        self.__requestId: int | None = None  # the request of this page being solved, the service can be shared with other pages
+        self.__sweep: tuple[str, float, float, int, str, dict[str, str]] | None = None  # the sweep waiting for its expression to be solved
+
+        self.initUi()
+
+    def initUi(self) -> None:
+        """
+        Initializes the UI components.
+        """
+
+        self.setLayout(QtWidgets.QVBoxLayout())
+
+        # add title
+        self.__label = QtWidgets.QLabel("Table")
+        self.layout().addWidget(self.__label)
+
+        # add line under title
+        self.__line = QtWidgets.QFrame()
+        self.__line.setFrameShape(QtWidgets.QFrame.Shape.HLine)
+        self.__line.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
+        self.layout().addWidget(self.__line)
+
+        # sweep settings
+        self.__variableBox = QtWidgets.QComboBox()
+        self.__startEdit = CaretLineEdit(setText='0', defaultText="start")
+        self.__stopEdit = CaretLineEdit(setText='10', defaultText="stop")
+        self.__stepEdit = CaretLineEdit(setText='1', defaultText="step")
+
+        self.__formWidget = QtWidgets.QWidget()
+        self.__formWidget.setLayout(QtWidgets.QFormLayout())
+        self.__formWidget.layout().setContentsMargins(0, 0, 0, 0)
+        self.__formWidget.layout().addRow("Variable", self.__variableBox)
+        self.__formWidget.layout().addRow("Start", self.__startEdit)
+        self.__formWidget.layout().addRow("Stop", self.__stopEdit)
+        self.__formWidget.layout().addRow("Step", self.__stepEdit)
+        self.layout().addWidget(self.__formWidget)
+
+        self.__button = QtWidgets.QPushButton("Calculate")
+        self.__button.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
+        self.__button.clicked.connect(self.calculate)
+        self.layout().addWidget(self.__button)
+
+        self.__status = QtWidgets.QLabel('')  # shows errors and the amount of rows
+        self.__status.setWordWrap(True)
+        self.layout().addWidget(self.__status)
+
+        # the rows have a fixed height so the view never measures rows that are not visible
+        self.__table = QtWidgets.QTableView()
+        self.__table.setModel(self.__model)
+        self.__table.verticalHeader().hide()
+        self.__table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        self.__table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
+        self.__table.setWordWrap(False)
+        self.layout().addWidget(self.__table)
+        self.layout().setStretchFactor(self.__table, 1)
+
+        self.updateVariables()
+
+    def label(self) -> QtWidgets.QLabel:
+        """
+        Returns the label widget.
+        """
+
+        return self.__label
+
+    def line(self) -> QtWidgets.QFrame:
+        """
+        Returns the line widget.
+        """
+
+        return self.__line
+
+    def button(self) -> QtWidgets.QPushButton:
+        """
+        Returns the calculate button.
+        """
+
+        return self.__button
+
+    def table(self) -> QtWidgets.QTableView:
+        """
+        Returns the table view.
+        """
+
+        return self.__table
+
+    def updateVariables(self) -> None:
+        """
+        Fills the variable selector with the variables of the expression, keeping the selected variable if it still exists.
+        """
+
+        selected = self.__variableBox.currentText()
+        variables = sorted(term for term in self.__terms() if term in symbols.accepted_variables)
+
+        self.__variableBox.blockSignals(True)
+        self.__variableBox.clear()
+        self.__variableBox.addItems(variables)
+        if selected in variables:
+            self.__variableBox.setCurrentText(selected)
+        self.__variableBox.blockSignals(False)
+
+    def calculate(self) -> None:
+        """
+        Compiles the expression and fills the table with the sweep, expressions that were not compiled before are solved in the background first.
+        """
+
+        try:
+            self.__sweep = self.__readSweep()
+
+        except Exception as error:
+            self.__showError(str(error))
+            return
+
+        expression, terms = self.__sweep[4:]
+        if self.__solver.is_compiled(expression, terms):
+            self.__setSweep(self.__solver.compile(expression, terms))
+            return
+
+        self.__status.setText("Compiling...")
+        self.__requestId = self.__service.submit(expression=expression, terms=terms, answer_display="Text", answer_copy="Text")
+
+    def __solved(self, solve: Solve) -> None:
+        if not self.__isRequestFinished():
+            return
+
+        expression, terms = self.__sweep[4:]
+
+        try:
+            batch = self.__solver.compile(expression, terms, solution=solve.get_solution())
+        except Exception as error:
+            self.__showError(str(error))
+            return
+
+        self.__setSweep(batch)
+
+    def __setSweep(self, batch: BatchSolve) -> None:
+        """
+        Fills the table with the sweep, once its expression is compiled.
+        """
+
+        variable, start, step, count = self.__sweep[:4]
+        self.__sweep = None
+
+        for name in batch.get_variables():
+            if name != variable:
+                self.__showError(f"'{name}' needs a value")
+                return
+
+        self.__model.setSweep(lambda inputs: batch.evaluate({variable: inputs}), start, step, count, (variable, "Value"))
+        self.__table.scrollToTop()
+        self.__status.setText(f"{count:,} rows")
+
+    def __failed(self, error: str) -> None:
+        if self.__isRequestFinished():
+            self.__showError(error)
+
+    def __isRequestFinished(self) -> bool:
+        """
+        Returns if a result of the service is for the request of this page.
+        A request replaced by a request of another page is dropped, and calculating again solves it.
+        """
+
+        if self.__requestId is None:
+            return False
+
+        if self.__requestId != self.__service.get_request_id():
+            self.__sweep = None
+            self.__status.setText('')
+
+        self.__requestId = None
+        return self.__sweep is not None
+
+    def __showError(self, error: str) -> None:
+        self.__sweep = None
+        self.__model.clear()
+        self.__status.setText(f"Error: {error}")
+
+    def __readSweep(self) -> tuple[str, float, float, int, str, dict[str, str]]:
+        """
+        Reads the sweep settings.
+
+        :return: The variable, start, step, amount of rows, expression, and terms.
+        """
+
+        variable = self.__variableBox.currentText()
+        if variable == '':
+            raise Exception("the expression has no variables")
+
+        try:
+            start = float(self.__startEdit.text())
+            stop = float(self.__stopEdit.text())
+            step = float(self.__stepEdit.text())
+        except ValueError:
+            raise Exception("start, stop, and step must be numbers")
+
+        if step == 0 or (stop - start) / step < 0:
+            raise Exception("step does not move from start towards stop")
+
+        count = math.floor((stop - start) / step + 1e-9) + 1  # the small amount stops rounding errors from dropping the last row
+        if count > self.__maxRows:
+            raise Exception(f"the table can have at most {self.__maxRows:,} rows")
+
+        terms = self.__terms() | {variable: ''}  # the swept variable is left as a symbol
+        expression = self.__edit.toPlainText() if isinstance(self.__edit, CaretTextEdit) else self.__edit.text()
+
+        return variable, start, step, count, expression, terms
@@ -1,6 +1,8 @@
 import pyperclip
 from PyQt6 import QtCore, QtWidgets
 
+from core.solve_service import SolveService
+from core.solver import Solver
 from core.style import Settings, Style
 import core.symbols as symbols
 from core.system_settings import OperatingSystem
@@ -8,20 +10,28 @@ from ui.common.CaretLineEdit import CaretLineEdit
 from ui.common.CaretTextEdit import CaretTextEdit
 from ui.common.VerticalPageSelector import VerticalPageSelector
 from ui.components.PageNotation import PageNotation
+from ui.components.PagePlot import PagePlot
+from ui.components.PageTable import PageTable
 from ui.components.PageTerms import PageTerms
 from ui.components.SectionGridButtons import SectionGridButtons
 
 
 class Sidebar(VerticalPageSelector):
 
-    def __init__(self, settings: Settings, style: Style, op: OperatingSystem, edit: CaretLineEdit | CaretTextEdit | None = None, parent: QtWidgets.QWidget | None = None) -> None:
+    def __init__(self, settings: Settings, style: Style, op: OperatingSystem, edit: CaretLineEdit | CaretTextEdit | None = None, parent: QtWidgets.QWidget | None = None, solver: Solver | None = None, service: SolveService | None = None) -> None:
         super().__init__(parent)
 
+        if solver is None:
+            solver = Solver()
+
+        if service is None:
+            service = SolveService(parent=self, preload=False)  # shared by the table and plot pages
+
         self._settings_user: Settings = settings
         self._style: Style = style
         self._op: OperatingSystem = op
 
-        n = 2
+        n = 4
         for i in range(n):  # create n pages
             button = QtWidgets.QPushButton()
             button.setMinimumHeight(self._settings_user.select_height)
@@ -56,6 +66,46 @@ class Sidebar(VerticalPageSelector):
                         elif j == 1:
                             section.setButtonWidth(self._settings_user.symbols_button_width[1])
 
+            elif i == 2:
+                button.setText("Table")
+
+                widget = PageTable(
+                    edit=edit,
+                    terms=self.terms,
+                    solver=solver,
+                    service=service,
+                    maxRows=self._settings_user.table_max_rows,
+                    blockSize=self._settings_user.table_block_size,
+                    cacheBlocks=self._settings_user.table_cache_blocks,
+                    precision=self._settings_user.table_precision
+                )
+                self.__PageTable = widget
+
+                # keeps the variable selector in sync with the variables section
+                sectionVariables = self.__PageTerms.getSections()[0]
+                sectionVariables.variableChanged.connect(lambda text, tag: self.__PageTable.updateVariables())
+                sectionVariables.variableRemoved.connect(lambda removed: self.__PageTable.updateVariables())
+
+            elif i == 3:
+                button.setText("Plot")
+
+                widget = PagePlot(
+                    edit=edit,
+                    terms=self.terms,
+                    solver=solver,
+                    service=service,
+                    samples=self._settings_user.plot_samples,
+                    maxDepth=self._settings_user.plot_max_depth,
+                    tolerance=self._settings_user.plot_tolerance,
+                    cacheTiles=self._settings_user.plot_cache_tiles,
+                    heatmapWorkers=self._settings_user.heatmap_workers,
+                    heatmapTilePixels=self._settings_user.heatmap_tile_pixels,
+                    heatmapSizes=self._settings_user.heatmap_sizes,
+                    heatmapCacheTiles=self._settings_user.heatmap_cache_tiles,
+                    heatmapContours=self._settings_user.heatmap_contours
+                )
+                self.__PagePlot = widget
+
             widget.layout().setContentsMargins(self._settings_user.content_margin, self._settings_user.content_margin, self._settings_user.content_margin, self._settings_user.content_margin)
 
             self.addPage(button, widget)
@@ -83,6 +133,12 @@ class Sidebar(VerticalPageSelector):
         # page terms
         self._style.set_page_terms(self.__PageTerms)
 
+        # page table
+        self._style.set_page_table(self.__PageTable)
+
+        # page plot
+        self._style.set_page_plot(self.__PagePlot)
+
     def __copy_button_label(self) -> None:
         button = self.sender()
         text = button.text()
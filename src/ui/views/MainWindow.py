@@ -1,12 +1,14 @@
-from PIL import Image
 import pyperclip
 from PyQt6 import QtCore, QtGui, QtWidgets
 
+from core.cache import LRUCache
 from core.files import path
 from core.solve import Solve
+from core.solve_service import SolveService
+from core.solver import Solver
 from core.style import Settings, Style
 import core.symbols as symbols
-from core.system_settings import OperatingSystem, get_data_path
+from core.system_settings import OperatingSystem
 from ui.common.CaretTextEdit import CaretTextEdit
 from ui.common.WrapTextButton import WrapTextButton
 from ui.views.ControlWindow import ControlWindow
@@ -32,14 +34,26 @@ class MainWindow(ControlWindow):
         self.__answer = None  # user shouldn't be able to access this string yet
         self.__answer_temp = self._settings_user.answer_default
         self.__solve = None
+        self.__is_preview = False  # if the answer shown is a text preview of an answer still being rendered
         self.__flip_type_toggle = False
 
+        # solves answers in a separate process
+        self.__solve_service = SolveService(self._settings_user.solve_timeout, self)
+        self.__solve_service.previewed.connect(self.__set_preview)
+        self.__solve_service.finished.connect(self.__set_answer)
+        self.__solve_service.failed.connect(self.__set_error)
+        self.__solve_service.completed.connect(self.__set_completed)
+
+        # solves the answer once the user stops typing
+        self.__live_timer = QtCore.QTimer(self)
+        self.__live_timer.setSingleShot(True)
+        self.__live_timer.timeout.connect(lambda: self.__get_answer(preview=True))
+
         self._box_answer = WrapTextButton(self._settings_user.answer_default, self, self._settings_user.box_answer_padding)
         self._box_answer.setCursor(QtCore.Qt.CursorShape.PointingHandCursor)
         self._box_answer.button().clicked.connect(self.__copy)
 
-        self.__answer_image_path_exact = get_data_path("latex_exact.png")  # gets the path of the latex image
-        self.__answer_image_path_approximate = get_data_path("latex_approximate.png")  # gets the path of the latex image
+        self.__answer_images = LRUCache(self._settings_user.answer_image_cache_size)  # decoded images of rendered answers, keyed by their render key
 
         # answer format label
         self._box_answer_format_label = QtWidgets.QLabel('', self)
@@ -50,6 +64,7 @@ class MainWindow(ControlWindow):
         self._user_select = None
         self._box_text = CaretTextEdit(parent=self, caretSize=self._settings_user.caret_size, setText="", defaultText="", tag="input")
         self._box_text.focusOutEvent = self.__box_text_focus_event
+        self._box_text.textChanged.connect(self.__box_text_changed)
 
         self._bar_spacer = QtWidgets.QWidget(self)  # adds a blank space to the right of the bar buttons
 
@@ -63,7 +78,9 @@ class MainWindow(ControlWindow):
         self._style.set_button_format_visibility(self._bar_answer, self._bar_format, False)
 
         # sidebar
-        self.__sidebar = Sidebar(self._settings_user, self._style, self._op, self._box_text, self)
+        self.__solver = Solver()  # keeps the compiled expressions of the table and plot pages
+        self.__page_service = SolveService(self._settings_user.solve_timeout, self, preload=False)  # solves the expressions of the table and plot pages, started once they are first used
+        self.__sidebar = Sidebar(self._settings_user, self._style, self._op, self._box_text, self, self.__solver, self.__page_service)
 
     def connect_button_settings(self, function) -> None:
         """
@@ -81,57 +98,122 @@ class MainWindow(ControlWindow):
         is_displaying_answer = not (self._box_answer.text() == self._settings_user.answer_default or self._box_answer.text()[:6] == "Error:")
 
         self.__update_colors(is_displaying_answer)  # updates all colors for MainWindow
+        self.__page_service.set_timeout(self._settings_user.solve_timeout)
 
         if is_displaying_answer:
             self.__get_answer(self.__flip_type_toggle)
 
-    def __get_answer(self, stop_format_reset: bool | None = None) -> None:
+    def __get_answer(self, stop_format_reset: bool | None = None, preview: bool = False) -> None:
         """
         Calculates the answer from the user input.
 
         Displays the answer in the answer box.
+
+        :param stop_format_reset: Keeps the current format instead of resetting it to the exact answer.
+        :param preview: Shows a text answer while the image of the answer is being rendered.
         """
 
+        self.__live_timer.stop()
+
         if stop_format_reset is None:
             self.__flip_type_toggle = False  # resets the format type
         else:  # stops the format from flipping if the apply button was pressed
             self.__flip_type_toggle = not stop_format_reset
 
+        text = self._box_text.toPlainText()  # gets the string from the text box
+
+        self.__box_answer_set(self._settings_user.answer_computing)  # shows the answer is being solved
+        self.__solve_service.set_timeout(self._settings_user.solve_timeout)
+        self.__solve_service.submit(
+            preview=preview,
+            expression=text,
+            terms=self.__sidebar.terms(),
+            answer_display=self._settings_user.answer_display,
+            answer_copy=self._settings_user.answer_copy,
+            use_commas=self._settings_user.use_commas,
+            render_color=self._settings_user.color_latex,
+            render_dpi=self._settings_user.latex_image_dpi,
+            max_exact_digits=self._settings_user.solve_max_exact_digits,
+            simplify_budget=self._settings_user.solve_simplify_budget,
+            race_simplify=self._settings_user.solve_race_simplify,
+            precision=self._settings_user.answer_precision
+        )
+
+    def __set_preview(self, solve: Solve) -> None:
+        """
+        Displays the text form of an answer until its image is rendered.
+        """
+
+        self.__set_answer(solve)
+        self.__is_preview = True
+
+    def __set_answer(self, solve: Solve) -> None:
+        """
+        Displays the solved answer in the answer box.
+        """
+
+        if self.__is_preview:  # shows the final answer in the same format as its preview
+            self.__flip_type_toggle = not self.__flip_type_toggle
+
+        self.__solve = solve
+        self.__is_preview = False
+        print(self.__solve.get_summary())  # shows the before and after expressions (for testing purposes)
+        self.__answer = self.__solve.get_exact()
+
+        warnings = self.__solve.get_warnings()
+        for warning in warnings:
+            print(f"Warning: {warning}")
+        self._box_answer.setToolTip('\n'.join(warnings))  # explains why an answer is only approximate
+
         self._style.set_button_format_visibility(self._bar_answer, self._bar_format, True)
+        if self.__solve.uses_constant_literal():  # hides the format button if a constant value was used
+            self._style.set_button_format_visibility(self._bar_answer, self._bar_format, False)
 
-        text = self._box_text.toPlainText()  # gets the string from the text box
+        self.__flip_type()
 
-        try:
-            self.__solve = Solve(text, self.__sidebar.terms(), self._settings_user.answer_display, self._settings_user.answer_copy, self._settings_user.use_commas, self._settings_user.color_latex, self._settings_user.latex_image_dpi)
-            self.__solve.print()  # shows the before and after expressions (for testing purposes)
-            self.__answer = self.__solve.get_exact()
+    def __set_completed(self, solve: Solve) -> None:
+        """
+        Replaces the displayed answer with one whose other form was computed in the background, so flipping the format is instant.
+        """
 
-            if self.__solve.uses_constant_literal():  # hides the format button if a constant value was used
-                self._style.set_button_format_visibility(self._bar_answer, self._bar_format, False)
+        self.__solve = solve
 
-            self.__flip_type()
+    def __set_error(self, error: str) -> None:
+        """
+        Displays an error that occurred while solving in the answer box.
+        """
 
-        except Exception as error:
-            self.__box_answer_set(f"Error: {error}", f"Error:\n{error}")  # displays the error
-            print(f"Error: {error}")
+        self.__box_answer_set(f"Error: {error}", f"Error:\n{error}")  # displays the error
+        print(f"Error: {error}")
 
     def __flip_type(self) -> None:
         """
         Flips the answer format between decimal and exact.
         """
 
+        # the approximate form is computed here if it was not computed in the background yet
+        try:
+            if self.__flip_type_toggle or self.__solve.uses_constant_literal():
+                answer = self.__solve.get_approximate()  # turns the answer into its decimal format
+                render_key = self.__solve.get_approximate_render_key()
+                png = self.__solve.get_approximate_image()
+                format_label = '≈'
+            else:
+                answer = self.__answer  # returns the original answer
+                render_key = self.__solve.get_exact_render_key()
+                png = self.__solve.get_exact_image()
+                format_label = '='
+
+        except Exception as error:
+            self.__set_error(str(error))
+            return
+
         self._box_answer.setText('')
         self._box_answer.setIcon(QtGui.QIcon())
 
         # uses answer_temp to save the answer
-        if self.__flip_type_toggle or self.__solve.uses_constant_literal():
-            self.__answer_temp = self.__solve.get_approximate()  # turns the answer into its decimal format
-            image_path = self.__answer_image_path_approximate
-            self._box_answer_format_label.setText('≈')
-        else:
-            self.__answer_temp = self.__answer  # returns the original answer
-            image_path = self.__answer_image_path_exact
-            self._box_answer_format_label.setText('=')
+        self.__answer_temp = answer
+        self._box_answer_format_label.setText(format_label)
 
         self.__flip_type_toggle = not self.__flip_type_toggle  # keeps track of which format is being displayed
 
@@ -139,12 +221,25 @@ class MainWindow(ControlWindow):
             self._box_answer.setText(self.__answer_temp)
 
         else:
-            image = Image.open(image_path)
-            icon = QtGui.QIcon(image_path)
-            self._box_answer.setIcon(icon, image.width / image.height)
+            image, icon = self.__answer_image(render_key, png)
+            self._box_answer.setIcon(icon, image.width() / image.height())
 
         self.__update_layout()
 
+    def __answer_image(self, render_key: tuple, png: bytes) -> tuple[QtGui.QImage, QtGui.QIcon]:
+        """
+        Returns the image and icon of a rendered answer, the png is only decoded the first time the answer is used.
+        """
+
+        image = self.__answer_images.get(render_key)
+
+        if image is None:
+            decoded = QtGui.QImage.fromData(png, "PNG")
+            image = decoded, QtGui.QIcon(QtGui.QPixmap.fromImage(decoded))
+            self.__answer_images.set(render_key, image)
+
+        return image
+
     def __box_answer_set(self, text: str, displayed_text: str = None) -> None:
         """
         Sets the answer button to the display the given text.
@@ -158,11 +253,30 @@ class MainWindow(ControlWindow):
         self._box_answer.setIcon(QtGui.QIcon())  # removes the image
         self._box_answer_format_label.setText('')  # removes the format icon
         self._box_answer.setText(displayed_text)  # sets the text of the button
+        self._box_answer.setToolTip('')  # removes the warnings of the previous answer
 
         self._style.set_button_format_visibility(self._bar_answer, self._bar_format, False)
 
         self.__answer = text
         self.__answer_temp = text
+        self.__is_preview = False
+
+    def __box_text_changed(self) -> None:
+        """
+        Solves the answer after the user stops typing, if live answers are turned on.
+        """
+
+        if not self._settings_user.live_answer:
+            return
+
+        self.__solve_service.cancel()  # the answer being solved is already out of date
+
+        if self._box_text.toPlainText().strip() == '':
+            self.__live_timer.stop()
+            self.__box_answer_set(self._settings_user.answer_default)
+            return
+
+        self.__live_timer.start(self._settings_user.live_answer_delay)  # restarts the delay
 
     def __box_text_focus_event(self, event: QtGui.QFocusEvent) -> None:
         """
@@ -182,24 +296,22 @@ class MainWindow(ControlWindow):
         Lets the user copy the answer by clicking the answer box.
         """
 
-        if self.__answer_temp == self._settings_user.answer_default or self.__answer_temp[:6] == "Error:":
+        if self.__answer_temp in (self._settings_user.answer_default, self._settings_user.answer_computing) or self.__answer_temp[:6] == "Error:":
             pyperclip.copy(self.__answer_temp)
             return
 
         if self.__flip_type_toggle:
-            if self._settings_user.answer_copy == "Image":
-                self._op.copy_image(get_data_path("latex_exact.png"))
-                return
-            else:
-                string = self.__solve.get_exact_copy()
+            copied = self.__solve.get_exact_copy()
         else:
-            if self._settings_user.answer_copy == "Image":
-                self._op.copy_image(get_data_path("latex_approximate.png"))
-                return
-            else:
-                string = self.__solve.get_approximate_copy()
+            copied = self.__solve.get_approximate_copy()
+
+        if isinstance(copied, bytes):  # previews, and worksheets with errors, are copied as text
+            render_key = self.__solve.get_exact_render_key() if self.__flip_type_toggle else self.__solve.get_approximate_render_key()
+            image, icon = self.__answer_image(render_key, copied)
+            self._op.copy_image(image)
+            return
 
-        pyperclip.copy(string)  # copies answer to clipboard
+        pyperclip.copy(copied)  # copies answer to clipboard
 
     def __update_colors(self, is_displaying_answer: bool) -> None:
         """
@@ -35,6 +35,11 @@ class SettingsWindow(ControlWindow):
                 (self.__color_preset, defaults[3], "Appearance", "Gray", "Blue", "Pink"),
                 (self.__text_color, defaults[4], "Text Color", "White", "Black"),
             )),
+
+            ("Solver", (
+                (self.__live_answer, defaults[5], "Live Answer", "Off", "On"),
+                (self.__precision, defaults[6], "Precision", "15", "50", "100", "1000"),
+            )),
         )
 
         self.__settings_list = settings_list
@@ -209,6 +214,20 @@ class SettingsWindow(ControlWindow):
 
         self._settings_user.answer_copy = label
 
+    def __live_answer(self, label: str) -> None:
+        """
+        Toggles solving the answer while the user types.
+        """
+
+        self._settings_user.live_answer = label == "On"
+
+    def __precision(self, label: str) -> None:
+        """
+        Sets the amount of significant digits of the approximate answer.
+        """
+
+        self._settings_user.answer_precision = int(label)
+
     def __color_preset(self, label: str) -> None:
         """
         Lets the user choose between multiple color themes.